@@ -0,0 +1,36 @@
+"""
+Compare the JSON backends of update_dict_from_json_file() 
+on generated documents of different sizes, each with and without
+the garbage collector paused (pause_gc=True, columns marked "+pause").
+
+Usage: python benchmarks/bench_json_backends.py [size_in_MB ...]
+(default sizes: 1 100 1000)
+"""
+
+import os, sys, tempfile, time
+from collectiontools_vrb import update_dict_from_json_file, available_json_backends
+from datagen import write_json_document
+
+def main(sizes_mb: list[float]):
+    variants = [(name, pause_gc) for name in available_json_backends()
+                for pause_gc in (False, True)]
+    print(f"{'size':>8} " + " ".join(f"{name + ('+pause' if pause_gc else ''):>12}"
+                                     for name, pause_gc in variants))
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for size_mb in sizes_mb:
+            path = os.path.join(tmp_dir, f"doc_{size_mb}.json")
+            write_json_document(path, int(size_mb * 1_000_000))
+            times = []
+            for name, pause_gc in variants:
+                d: dict = {}
+                start = time.perf_counter()
+                ok = update_dict_from_json_file(d, path, json_backend=name, reraise_exc=True,
+                                                pause_gc=pause_gc)
+                times.append(time.perf_counter() - start)
+                assert ok
+                del d
+            print(f"{size_mb:>6}MB " + " ".join(f"{t:>11.3f}s" for t in times))
+            os.remove(path)
+
+if __name__ == "__main__":
+    main([float(arg) for arg in sys.argv[1:]] or [1, 100, 1000])
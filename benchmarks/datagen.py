@@ -0,0 +1,105 @@
+"""
+Synthetic data for the benchmarks. All generators are deterministic,
+so that results of different runs are comparable.
+"""
+
+from __future__ import annotations
+
+import json, os
+from typing import Any
+
+def wide_dict(width: int, placeholder_every: int = 10) -> dict[str, Any]:
+    """ Return a flat dict with width entries, every placeholder_every-th
+    value containing a placeholder.
+    """
+    return {f"key{i}": (f"value {i} of {{name{i % 100}}}" if i % placeholder_every == 0
+                        else f"value {i}")
+            for i in range(width)}
+
+def deep_dict(depth: int, breadth: int = 2) -> dict[str, Any]:
+    """ Return a dict nested depth levels deep, each level holding
+    breadth string values (one with a placeholder) and one list.
+    """
+    root: dict[str, Any] = {}
+    node = root
+    for level in range(depth):
+        for i in range(breadth):
+            node[f"value{i}"] = f"level {level}: {{name{(level + i) % 50}}}" if i == 0 else f"level {level}"
+        node["items"] = [f"{{name{level % 50}}}", level, None]
+        node["child"] = node = {}
+    return root
+
+def placeholder_dense(count: int, per_string: int = 8) -> dict[str, Any]:
+    """ Return a dict of count sections, whose strings consist mainly
+    of placeholders (about per_string each).
+    """
+    return {f"section{i}": {"text": " ".join(f"{{name{(i + j) % 200}}}" for j in range(per_string)),
+                            "list": [f"{{name{i % 200}}}/{{name{(i + 1) % 200}}}", "plain"],
+                            "escaped": r"\{not_a_placeholder\}"}
+            for i in range(count)}
+
+def referencing_dict(count: int, depth: int) -> dict[str, Any]:
+    """ Return a dict of count sections, whose values reference the value
+    before them (e.g. "{section3.level1}/2"), depth levels of indirection
+    deep, the first ones referencing top-level key "base".
+    """
+    sections: dict[str, Any] = {"base": "/srv"}
+    for i in range(count):
+        section = sections[f"section{i}"] = {"level0": f"{{base}}/{i}"}
+        for level in range(1, depth):
+            section[f"level{level}"] = f"{{section{i}.level{level - 1}}}/{level}"
+    return sections
+
+def tree_dict(levels: int, breadth: int, leaves: int = 5) -> dict[str, Any]:
+    """ Return a tree of nested dicts: breadth children per level
+    and leaves leaf values at the bottom level.
+    """
+    if levels == 0:
+        return {f"item{i}": i for i in range(leaves)}
+    return {f"node{i}": tree_dict(levels - 1, breadth, leaves) for i in range(breadth)}
+
+def tree_paths(levels: int, breadth: int, leaves: int = 5) -> list[str]:
+    """ Return all leaf paths of tree_dict(levels, breadth, leaves). """
+    paths = [""]
+    for _ in range(levels):
+        paths = [f"{p}node{i}." for p in paths for i in range(breadth)]
+    return [f"{p}item{i}" for p in paths for i in range(leaves)]
+
+def key_value_text(lines: int, sep: str = "=") -> str:
+    """ Return lines of key-value-pairs, with some comment-like lines
+    (no sep) and padding to be stripped in between.
+    """
+    return "".join(f"# section {i}\n" if i % 50 == 0 else f"  key.{i} {sep} value number {i}  \n"
+                   for i in range(lines))
+
+def write_key_value_file(path: str, lines: int, sep: str = "=") -> str:
+    """ Write key_value_text(lines, sep) to path. Returns path. """
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write(key_value_text(lines, sep))
+    return path
+
+def write_key_value_files(directory: str, count: int, lines: int) -> list[str]:
+    """ Write count small key-value files to directory. Returns their paths. """
+    return [write_key_value_file(os.path.join(directory, f"small{i}.properties"), lines)
+            for i in range(count)]
+
+def write_json_file(path: str, value: Any) -> str:
+    """ Write value as JSON to path. Returns path. """
+    with open(path, "w", encoding="utf-8") as fp:
+        json.dump(value, fp)
+    return path
+
+def write_json_document(path: str, size: int) -> str:
+    """ Write a JSON document of about size bytes to path. Returns path. """
+    with open(path, "w", encoding="utf-8") as fp:
+        fp.write("{")
+        written, i = 1, 0
+        while written < size:
+            entry = json.dumps({"name": f"entry {i}", "value": i * 1.5, "tags": ["a", "b", "ä"],
+                                "nested": {"flag": i % 2 == 0, "text": "{placeholder}" * 3}})
+            item = f'{"," if i else ""}"key{i}": {entry}'
+            fp.write(item)
+            written += len(item)
+            i += 1
+        fp.write("}")
+    return path
@@ -0,0 +1,318 @@
+"""
+Benchmark suite for collectiontools_vrb.
+
+Times CollectionTranslator, the update_dict_from_... loaders and the
+key path lookups on synthetic data (see datagen.py). The URL loaders
+are timed against a local aiohttp server, so no network is needed.
+
+Usage: python benchmarks/run_benchmarks.py [options]
+
+    -o, --output FILE      save the results as JSON to FILE
+    -c, --compare FILE     compare the results to those saved in FILE;
+                           exit code 1 if a benchmark got slower by more
+                           than the threshold
+    -t, --threshold RATIO  threshold for --compare. Defaults to 1.25
+    -k, --filter TEXT      run only benchmarks whose name contains TEXT
+                           (may be given several times)
+    --scale FACTOR         scale the data sizes, e.g. 0.1 for a quick run.
+                           Only results of equal scale are comparable.
+    --repeat N             number of timing rounds per benchmark. Defaults to 5
+
+E.g. save a baseline, change the code, and check for regressions:
+
+    python benchmarks/run_benchmarks.py -o baseline.json
+    python benchmarks/run_benchmarks.py -c baseline.json
+"""
+
+from __future__ import annotations
+
+import argparse, asyncio, gc, hashlib, json, marshal, os, platform
+import statistics, sys, tempfile, threading, time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from typing import Any, Callable, NamedTuple
+
+from aiohttp import web
+
+import collectiontools_vrb as ct
+from collectiontools_vrb.__version__ import __version__
+import datagen
+
+RESULTS_FORMAT = 1
+
+class Case(NamedTuple):
+    name: str
+    # timed function, called with the result of setup (or None)
+    func: Callable[[Any], Any]
+    # untimed, called before each call of func, e.g. to copy data which func changes
+    setup: Callable[[], Any]|None = None
+
+def _copy(val: Any) -> Callable[[], Any]:
+    data = marshal.dumps(val)
+    return lambda: marshal.loads(data)
+
+def measure(case: Case, repeat: int, round_time: float = 0.1) -> dict[str, Any]:
+    """ Return min, median and max seconds per call of case.func. The number
+    of calls per round is chosen so that a round takes about round_time.
+    """
+    def run(number: int) -> float:
+        args = [case.setup() for _ in range(number)] if case.setup else [None] * number
+        gc.collect()
+        start = time.perf_counter()
+        for arg in args:
+            case.func(arg)
+        return (time.perf_counter() - start) / number
+
+    number = 1
+    per_call = run(number)
+    while per_call * number < round_time and number < 100_000:
+        number = max(number * 2, min(int(round_time / max(per_call, 1e-9)), 100_000))
+        per_call = run(number)
+    times = [per_call] + [run(number) for _ in range(repeat - 1)]
+    return {"min": min(times), "median": statistics.median(times),
+            "max": max(times), "number": number, "repeat": repeat}
+
+######################################
+# local HTTP server
+######################################
+
+class LocalServer:
+    """ aiohttp server in a background thread, serving /kv/<lines>
+    with key-value text of the given number of lines, and an ETag.
+    """
+
+    def __init__(self):
+        self._bodies: dict[int, tuple[bytes, str]] = {}
+        self._loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_get("/kv/{lines}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        self._loop.run_until_complete(site.start())
+        self.port = self._runner.addresses[0][1]
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def url(self, lines: int, variant: int = 0) -> str:
+        return f"http://127.0.0.1:{self.port}/kv/{lines}?v={variant}"
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        lines = int(request.match_info["lines"])
+        if lines not in self._bodies:
+            body = datagen.key_value_text(lines).encode()
+            self._bodies[lines] = (body, f'"{hashlib.md5(body).hexdigest()}"')
+        body, etag = self._bodies[lines]
+        if request.headers.get("If-None-Match") == etag:
+            return web.Response(status=304, headers={"ETag": etag})
+        return web.Response(body=body, content_type="text/plain", charset="utf-8",
+                            headers={"ETag": etag})
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+######################################
+# benchmarks
+######################################
+
+def translator_cases(scale: float, resources: ExitStack) -> list[Case]:
+    def func(key: str) -> str:
+        return f"[{key}]"
+    translator = ct.CollectionTranslator(func)
+    cached = ct.CollectionTranslator(func, resolver_cache=ct.ResolverCache())
+    wide = _copy(datagen.wide_dict(int(10_000 * scale)))
+    deep = _copy(datagen.deep_dict(max(int(500 * scale), 1)))
+    dense = _copy(datagen.placeholder_dense(int(2_000 * scale)))
+    referencing = _copy(datagen.referencing_dict(int(1_000 * scale), 10))
+    text = " ".join(f"{{name{i}}} and" for i in range(8))
+    index = translator.translate_indexed(dense())
+    wide_doc, dense_doc = wide(), dense()
+    executor = resources.enter_context(ThreadPoolExecutor(4))
+
+    async def async_func(key: str) -> str:
+        return f"[{key}]"
+
+    return [
+        Case("translate_str.8_placeholders", lambda _: translator.translate_str(text)),
+        Case("translate.wide", translator.translate, wide),
+        Case("translate.deep", translator.translate, deep),
+        Case("translate.dense", translator.translate, dense),
+        Case("translate.dense_resolver_cache", cached.translate, dense),
+        # copy on write: the original is not changed, so it needs no copy
+        Case("translate.wide_not_inplace", lambda _: translator.translate(wide_doc, inplace=False)),
+        Case("translate.dense_not_inplace", lambda _: translator.translate(dense_doc, inplace=False)),
+        Case("translate_references.10_levels", translator.translate_references, referencing),
+        # lazy view: translates only the values read
+        Case("translate_lazy.wide_read_10_keys",
+             lambda _: [translator.translate_lazy(wide_doc)[f"key{i}"] for i in range(0, 100, 10)]),
+        Case("translate_parallel.dense",
+             lambda val: translator.translate_parallel(val, executor, chunk_size=250), dense),
+        Case("translate_async.dense",
+             lambda val: asyncio.run(translator.translate_async(val, async_func)), dense),
+        Case("translate_indexed.dense", translator.translate_indexed, dense),
+        Case("TranslationIndex.retranslate_1_key", lambda _: index.retranslate(["name7"])),
+    ]
+
+def file_cases(scale: float, tmp_dir: str) -> list[Case]:
+    kv_path = datagen.write_key_value_file(os.path.join(tmp_dir, "large.properties"),
+                                           int(100_000 * scale))
+    small_dir = os.path.join(tmp_dir, "small")
+    os.mkdir(small_dir)
+    small_paths = datagen.write_key_value_files(small_dir, max(int(200 * scale), 1), 50)
+    json_path = datagen.write_json_document(os.path.join(tmp_dir, "doc.json"),
+                                            int(5_000_000 * scale))
+    levels, breadth = 3, max(int(10 * scale), 2)
+    tree_path = datagen.write_json_file(os.path.join(tmp_dir, "tree.json"),
+                                        datagen.tree_dict(levels, breadth))
+    mandatory = datagen.tree_paths(levels, breadth)[:500]
+    kv_cache, json_cache = ct.FileParseCache(), ct.FileParseCache()
+
+    def load(loader: Callable[..., bool], *args, **kwargs) -> Callable[[Any], None]:
+        def call(_):
+            assert loader({}, *args, reraise_exc=True, **kwargs)
+        return call
+
+    return [
+        Case("key_value_file.large", load(ct.update_dict_from_key_value_file, kv_path)),
+        Case("key_value_file.large_cached",
+             load(ct.update_dict_from_key_value_file, kv_path, cache=kv_cache)),
+        Case("key_value_files.many_small",
+             load(ct.update_dict_from_key_value_files, small_paths)),
+        Case("json_file.large", load(ct.update_dict_from_json_file, json_path)),
+        Case("json_file.large_cached",
+             load(ct.update_dict_from_json_file, json_path, cache=json_cache)),
+        Case("json_file.mandatory_keys",
+             load(ct.update_dict_from_json_file, tree_path, mandatory_keys=mandatory)),
+    ]
+
+def path_cases(scale: float) -> list[Case]:
+    levels, breadth = 4, max(int(8 * scale), 2)
+    tree = datagen.tree_dict(levels, breadth)
+    paths = datagen.tree_paths(levels, breadth)[::7] + ["node0.missing.item0"]
+    index = ct.PathIndex(tree)
+    trie = ct.KeyPathTrie(paths)
+    # defaults, file, URL and overrides, the latter changing on each reload
+    layered = ct.LayeredConfig({"defaults": tree, "file": datagen.tree_dict(levels, breadth),
+                                "url": datagen.tree_dict(levels - 1, breadth)})
+    overrides = [{"node0": {"node0": {"item0": i}}} for i in range(2)]
+
+    def contains_all(d: Any) -> Callable[[Any], None]:
+        def call(_):
+            for path in paths:
+                ct.dict_contains_path(d, path)
+        return call
+
+    def get_all(_):
+        for path in paths:
+            layered.get_path(path, None)
+
+    def reload_overrides(_):
+        for data in overrides:
+            layered.set_layer("overrides", data)
+            get_all(_)
+
+    return [
+        Case("dict_contains_path.dict", contains_all(tree)),
+        Case("dict_contains_path.PathIndex", contains_all(index)),
+        Case("KeyPathTrie.missing", lambda _: trie.missing(tree)),
+        Case("PathIndex.build", lambda _: ct.PathIndex(tree)),
+        Case("LayeredConfig.get_path_cached", get_all),
+        Case("LayeredConfig.reload_layer_2x", reload_overrides),
+    ]
+
+def url_cases(scale: float, resources: ExitStack) -> list[Case]:
+    server = LocalServer()
+    resources.callback(server.close)
+    lines = int(10_000 * scale)
+    url = server.url(lines)
+    small_urls = [server.url(100, i) for i in range(max(int(50 * scale), 1))]
+    url_cache = ct.URLCache()
+    loader = resources.enter_context(ct.URLLoader())
+
+    def load(*args, **kwargs) -> Callable[[Any], None]:
+        def call(_):
+            assert ct.update_dict_from_url({}, *args, reraise_exc=True, **kwargs)
+        return call
+
+    def load_many(_):
+        assert ct.update_dict_from_urls({}, small_urls, reraise_exc=True, loader=loader)
+
+    return [
+        Case("url.large", load(url)),
+        Case("url.large_stream", load(url, stream=True)),
+        Case("url.large_not_modified", load(url, cache=url_cache)),
+        Case("urls.many_small_loader", load_many),
+    ]
+
+######################################
+# results
+######################################
+
+def compare(results: dict[str, Any], baseline: dict[str, Any], threshold: float) -> bool:
+    """ Print current vs. baseline (min) times. Return False if any
+    benchmark got slower than threshold times its baseline.
+    """
+    ok = True
+    if baseline.get("meta", {}).get("scale") != results["meta"]["scale"]:
+        print("warning: results were measured with different --scale")
+    print(f"\n{'benchmark':40} {'baseline':>12} {'current':>12} {'ratio':>7}")
+    for name, current in results["results"].items():
+        base = baseline["results"].get(name)
+        if base is None:
+            print(f"{name:40} {'-':>12} {current['min'] * 1e3:>10.3f}ms {'new':>7}")
+            continue
+        ratio = current["min"] / base["min"]
+        flag = ""
+        if ratio > threshold:
+            flag = "  SLOWER"
+            ok = False
+        print(f"{name:40} {base['min'] * 1e3:>10.3f}ms {current['min'] * 1e3:>10.3f}ms "
+              f"{ratio:>7.2f}{flag}")
+    return ok
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark suite for collectiontools_vrb")
+    parser.add_argument("-o", "--output")
+    parser.add_argument("-c", "--compare")
+    parser.add_argument("-t", "--threshold", type=float, default=1.25)
+    parser.add_argument("-k", "--filter", action="append", default=[])
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    results: dict[str, Any] = {
+        "format": RESULTS_FORMAT,
+        "meta": {"version": __version__, "python": platform.python_version(),
+                 "implementation": platform.python_implementation(),
+                 "platform": platform.platform(), "cpu_count": os.cpu_count(),
+                 "scale": args.scale, "time": time.strftime("%Y-%m-%dT%H:%M:%S%z")},
+        "results": {},
+    }
+    with ExitStack() as resources:
+        tmp_dir = resources.enter_context(tempfile.TemporaryDirectory())
+        cases = (translator_cases(args.scale, resources) + file_cases(args.scale, tmp_dir)
+                 + path_cases(args.scale) + url_cases(args.scale, resources))
+        print(f"{'benchmark':40} {'min':>12} {'median':>12} {'calls':>7}")
+        for case in cases:
+            if args.filter and not any(f in case.name for f in args.filter):
+                continue
+            result = measure(case, args.repeat)
+            results["results"][case.name] = result
+            print(f"{case.name:40} {result['min'] * 1e3:>10.3f}ms "
+                  f"{result['median'] * 1e3:>10.3f}ms {result['number']:>7}")
+
+    if args.output:
+        with open(args.output, "w") as fp:
+            json.dump(results, fp, indent=2)
+    if args.compare:
+        with open(args.compare) as fp:
+            baseline = json.load(fp)
+        if not compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -12,10 +12,22 @@ Various tools to handle collection I/O and transformations.
 
 Read collection data from the given URL. 
 
+```function update_dict_from_urls()```
+
+Read collection data from several URLs concurrently, merged in the given order.
+
+```function update_dict_from_url_async(), update_dict_from_urls_async()```
+
+Async versions of the above, for use within a running event loop.
+
 ```function update_dict_from_key_value_file()```
 
 Read collection data from the given file. 
 
+```function update_dict_from_key_value_files()```
+
+Read collection data from several files concurrently, merged in the given order.
+
 ```function dict_contains_path()```
 
 Tests if a given path is a valid key inside the given dict.
@@ -32,54 +44,185 @@ Search strings, lists or dicts for placeholders using a
 regular expression provided by the user. Replace the matches 
 with a value provided by a translator function, which is 
 as well provided by the user.
+
+```class ResolverCache```
+
+Cache for the values returned by a translator function, optionally
+bounded in size (LRU) and with expiring entries. Pass it to 
+CollectionTranslator to call the translator function only once per
+placeholder name.
+
+```class TranslationIndex```
+
+Returned by CollectionTranslator.translate_indexed(). Knows which 
+strings contain which placeholders, so that only the strings affected
+by changed placeholder values need to be re-rendered.
+
+```class TranslatedMapping, TranslatedSequence```
+
+Returned by CollectionTranslator.translate_lazy(). Read-only views of
+a collection, which translate a value when it is accessed for the first
+time. Reading a few keys of a large collection thus costs only what
+these keys cost; the collection itself is not changed.
+
+```class CyclicReferenceError```
+
+Raised by CollectionTranslator.translate_references(), which resolves
+placeholders referring to other keys of the same collection, e.g.
+"{paths.base}/logs", in a single call, however deeply the references
+are nested, if the references form a cycle.
+
+## urlloader.py
+
+```class URLLoader```
+
+Reusable loader for key-value data from URLs. Keeps a pooled
+aiohttp session and fetches many URLs concurrently.
+
+```class URLCache```
+
+Cache for URLLoader and the update_dict_from_url functions. Stores
+the parsed results with their ETag / Last-Modified validators and
+reuses them when the server answers "304 Not Modified". A cache with
+a path is saved to its JSON file once per call, or by calling save().
+
+## filecache.py
+
+```class FileParseCache```
+
+Cache for parsed files, validated by (st_mtime_ns, st_size, st_ino).
+Pass it (or True for the process-wide default_file_cache) as cache 
+argument to update_dict_from_json_file() or update_dict_from_key_value_file(s)().
+For JSON files, the default FileParseCache(copy=True) hands out copies of
+cached results, which takes almost as long as parsing. FileParseCache(copy=False)
+makes reading an unchanged file cost one os.stat() call, but the results
+are shared and must not be changed.
+
+```class FileWatcher```
+
+Poll files for changes, reload only the changed ones and notify subscribers.
+
+## jsonbackends.py
+
+```function set_json_backend(), register_json_backend()```
+
+Select the JSON decoder used by update_dict_from_json_file() globally
+("json", "orjson", "ujson", "auto" or a function), or register a new one.
+Per call, use its argument json_backend. Its argument pause_gc=True
+disables the garbage collector while decoding, which speeds up large
+documents, but affects all threads.
+
+## keypath.py
+
+```class KeyPath```
+
+Key path into a nested dict (e.g. "db.host"), split into its elements
+once. Test for, get, set or delete the value at the path. The functions
+get_path(), set_path() and delete_path() do the same for a path string.
+
+```class KeyPathTrie```
+
+Set of key paths stored as a trie. Checks a nested dict for all of them
+in a single traversal and returns all missing paths.
+
+```class PathIndex```
+
+Nested dict with a flat index of all its key paths, for lookups of
+"db.host" etc. in constant time. Behaves like a dict at the top level,
+so the update_dict_from_... functions can load into it directly.
+
+## metrics.py
+
+```function add_hook(), remove_hook()```
+
+Register a function called after each call of a loader function or 
+of a CollectionTranslator.translate... method with its timing and counters 
+(bytes read, lines parsed, keys, placeholders replaced, translator function 
+calls and latencies). Without hooks, the overhead is negligible.
+
+```class Stats```
+
+Hook aggregating these events, with latency histograms (class Histogram).
+
+## layered.py
+
+```class LayeredConfig```
+
+Named layers of nested dicts (e.g. defaults, file, URL, overrides),
+looked up by key path without merging them. Later layers override
+earlier ones, nested dicts are merged key by key. Each layer is loaded
+(using the update_dict_from_... functions) or replaced on its own;
+looked up values are cached, and replacing a layer discards only those
+of the paths it contains.
 """
 
 from __future__ import annotations
     
 from types import FrameType
-from typing import Any as Any
-from logging import Logger
-import aiohttp, asyncio, json, traceback, inspect, ssl
+from typing import Any as Any, Coroutine, Iterable
+import codecs
 
+# aiohttp, asyncio etc. are imported when needed, since they take long to import.
+# URLLoader and URLCache are imported on first access (see __getattr__).
 from typing import TYPE_CHECKING
 if TYPE_CHECKING:
     from _typeshed import SupportsWrite
+    from logging import Logger
+    from concurrent.futures import Executor, Future
+    import aiohttp, ssl
+    from collectiontools_vrb.urlloader import URLLoader, URLCache
 
 from collectiontools_vrb.collectiontranslator import *
-
-def _print_error(msg: str, target: SupportsWrite[str]|Logger):
-    if isinstance(target, Logger):
-        target.error(msg)
-    else:
-        print(msg, file=target)
-
-async def _update_dict_from_url(d: dict, url: str, sep: str, strip: bool,
-                                ssl: bool|aiohttp.Fingerprint|ssl.SSLContext) -> aiohttp.ClientResponse:
-    """Internal method using asyncio to carry out
-    the task of updateFromURL.
-    See: updateDictFromURL(d, url, sep)
+from collectiontools_vrb.filecache import (FileParseCache, FileWatcher, default_file_cache,
+                                           file_signature, _copy_containers)
+from collectiontools_vrb.jsonbackends import (JSONBackend, register_json_backend, set_json_backend,
+                                              get_json_backend, available_json_backends,
+                                              _gc_paused)
+from collectiontools_vrb.keypath import (KeyPath, KeyPathTrie, PathIndex, compile_keypath,
+                                          get_path, set_path, delete_path, _compile_trie)
+from collectiontools_vrb.layered import LayeredConfig
+from collectiontools_vrb.metrics import (Hook, Histogram, Stats, add_hook, remove_hook,
+                                          _observed, _current)
+from collectiontools_vrb._common import (_print_error, _format_exc, _update_dict_from_lines,
+                                         _LineSplitter)
+
+_LAZY_NAMES = {"URLLoader": "collectiontools_vrb.urlloader",
+               "URLCache": "collectiontools_vrb.urlloader"}
+
+def __getattr__(name: str) -> Any:
+    # import the names in _LAZY_NAMES on first access
+    module_name = _LAZY_NAMES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    value = globals()[name] = getattr(importlib.import_module(module_name), name)
+    return value
+
+def _run_sync(coro: Coroutine[Any, Any, Any]) -> Any:
+    """ Run coro to completion from synchronous code. If an event loop
+    is already running in this thread (where asyncio.run fails), 
+    coro is run in a new event loop in a separate thread.
     """
-    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(ssl = ssl)) as session:
-        async with session.get(url) as response:
-            if response.ok:
-                text: str = await response.text()
-            else:
-                raise Exception(
-                    f"Unable to read from URL {url}. Status {response.status}")
-            for l in text.splitlines():
-                parts = l.split(sep, 1)
-                if len(parts) == 2:
-                    if strip:
-                        d[parts[0].strip()] = parts[1].strip()
-                    else:
-                        d[parts[0]] = parts[1]
-    return response
-    
-def update_dict_from_url(d: dict, url: str, *,
+    import asyncio
+    try:
+        loop_running = asyncio.get_running_loop().is_running()
+    except RuntimeError:
+        loop_running = False
+    if not loop_running:
+        return asyncio.run(coro)
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+@_observed("update_dict_from_url")
+def update_dict_from_url(d: dict|PathIndex, url: str, *,
             sep: str = "=", strip: bool = True,
             reraise_exc: bool = False, 
             print_errors_to: SupportsWrite[str]|Logger|None = None,
-            ssl: bool|aiohttp.Fingerprint|ssl.SSLContext = True) -> bool:
+            ssl: bool|aiohttp.Fingerprint|ssl.SSLContext = True,
+            stream: bool = False, max_size: int|None = None,
+            timeout: float|None = 300.0,
+            cache: URLCache|None = None, loader: URLLoader|None = None) -> bool:
     """Read collection data from the given URL. 
 
     The data must consist of lines of key-value-pairs
@@ -87,7 +230,7 @@ def update_dict_from_url(d: dict, url: str, *,
     If sep == "=", NAME=Miller results to a key-value-pair "NAME":"Miller".
 
     Args:
-        d (dict): dictionary to be updated
+        d (dict|PathIndex): dictionary to be updated
         url (str): URL to read from
         sep (str, optional): String to separate key from value. Defaults to "=".
         strip (bool, optional): Strip trailing and leading whitespace from keys and values? Defaults to True.
@@ -101,6 +244,17 @@ def update_dict_from_url(d: dict, url: str, *,
             (ssl.create_default_context() is used), False for skip SSL certificate validation, 
             aiohttp.Fingerprint for fingerprint validation, ssl.SSLContext for custom SSL certificate validation.
             See aiohttp.TCPConnector. Defaults to True.
+        stream (bool, optional): parse the response while it is downloaded instead of
+            reading the whole body first. See URLLoader. Defaults to False.
+        max_size (int|None, optional): maximum size of the response body in bytes,
+            None for no limit. See URLLoader. Defaults to None.
+        timeout (float|None, optional): timeout in seconds for reading a URL,
+            None for no timeout. Defaults to 300.0.
+        cache (URLCache|None, optional): cache of results, validated by conditional
+            requests (ETag / Last-Modified). See URLCache. Defaults to None.
+        loader (URLLoader|None, optional): loader to use instead of a new session
+            (ssl, stream, max_size, timeout and cache are ignored then). See URLLoader. 
+            Defaults to None.
 
     Raises:
         Exception: if URL can not be read properly (only if reraise_exc == True)
@@ -108,22 +262,152 @@ def update_dict_from_url(d: dict, url: str, *,
     Returns:
         True, if HTTP status code of get(url) operation is less than 400, False otherwise
     """
+    return update_dict_from_urls(d, [url], sep=sep, strip=strip, reraise_exc=reraise_exc,
+                                 print_errors_to=print_errors_to, ssl=ssl, 
+                                 stream=stream, max_size=max_size, timeout=timeout,
+                                 cache=cache, loader=loader)
+
+@_observed("update_dict_from_urls")
+def update_dict_from_urls(d: dict|PathIndex, urls: Iterable[str], *,
+            sep: str = "=", strip: bool = True,
+            reraise_exc: bool = False, 
+            print_errors_to: SupportsWrite[str]|Logger|None = None,
+            ssl: bool|aiohttp.Fingerprint|ssl.SSLContext = True,
+            stream: bool = False, max_size: int|None = None,
+            timeout: float|None = 300.0,
+            cache: URLCache|None = None, loader: URLLoader|None = None) -> bool:
+    """Read collection data from the given URLs concurrently. d is updated
+    in the order of urls, i.e. values from later URLs take precedence.
+    URLs which can't be read are skipped.
+
+    May be called from within a running event loop (which is blocked
+    until all URLs have been read, though). Use update_dict_from_urls_async()
+    in async code instead.
+
+    For the arguments: see update_dict_from_url(). 
+
+    Returns:
+        True, if all URLs could be read, False otherwise
+    """
     try:
-        response = asyncio.run(_update_dict_from_url(d=d, url=url, sep=sep, strip=strip, ssl=ssl))
+        urls = list(urls)
+        fields = _current()
+        if fields is not None:
+            fields["urls"] = len(urls)
+        if loader is not None:
+            return loader.run(loader.update_dict_from_urls(
+                d, urls, sep=sep, strip=strip, reraise_exc=reraise_exc,
+                print_errors_to=print_errors_to))
+        return _run_sync(update_dict_from_urls_async(
+            d, urls, sep=sep, strip=strip, reraise_exc=reraise_exc,
+            print_errors_to=print_errors_to, ssl=ssl, stream=stream, max_size=max_size,
+            timeout=timeout, cache=cache))
     except Exception as exc:
         # reraise exception if raiseExc == True
         if reraise_exc:
             raise
         # else print error if requested to do so
         elif print_errors_to:
-            _print_error(traceback.format_exc(), target=print_errors_to)
+            _print_error(_format_exc(), target=print_errors_to)
         return False
-    return response.ok
 
-def update_dict_from_key_value_file(d: dict, path: str, *,
+@_observed("update_dict_from_url_async")
+async def update_dict_from_url_async(d: dict|PathIndex, url: str, *,
+            sep: str = "=", strip: bool = True,
+            reraise_exc: bool = False, 
+            print_errors_to: SupportsWrite[str]|Logger|None = None,
+            ssl: bool|aiohttp.Fingerprint|ssl.SSLContext = True,
+            stream: bool = False, max_size: int|None = None,
+            timeout: float|None = 300.0,
+            cache: URLCache|None = None, loader: URLLoader|None = None) -> bool:
+    """Async version of update_dict_from_url(). 
+    For the arguments: see there.
+    """
+    return await update_dict_from_urls_async(
+        d, [url], sep=sep, strip=strip, reraise_exc=reraise_exc,
+        print_errors_to=print_errors_to, ssl=ssl, stream=stream, 
+        max_size=max_size, timeout=timeout, cache=cache, loader=loader)
+
+@_observed("update_dict_from_urls_async")
+async def update_dict_from_urls_async(d: dict|PathIndex, urls: Iterable[str], *,
+            sep: str = "=", strip: bool = True,
+            reraise_exc: bool = False, 
+            print_errors_to: SupportsWrite[str]|Logger|None = None,
+            ssl: bool|aiohttp.Fingerprint|ssl.SSLContext = True,
+            stream: bool = False, max_size: int|None = None,
+            timeout: float|None = 300.0,
+            cache: URLCache|None = None, loader: URLLoader|None = None) -> bool:
+    """Async version of update_dict_from_urls().
+    For the arguments: see update_dict_from_url().
+    """
+    if loader is not None:
+        return await loader.update_dict_from_urls(
+            d, urls, sep=sep, strip=strip, reraise_exc=reraise_exc, 
+            print_errors_to=print_errors_to)
+    from collectiontools_vrb.urlloader import URLLoader
+    async with URLLoader(ssl=ssl, stream=stream, max_size=max_size, 
+                         timeout=timeout, cache=cache) as loader:
+        return await loader.update_dict_from_urls(
+            d, urls, sep=sep, strip=strip, reraise_exc=reraise_exc, 
+            print_errors_to=print_errors_to)
+
+def _file_cache(cache: FileParseCache|bool|None, path: Any) -> FileParseCache|None:
+    """ Return the cache to be used for path according to argument cache
+    of the update_dict_from_..._file functions. File descriptors are not cached.
+    """
+    if cache is None or cache is False or not isinstance(path, str):
+        return None
+    return default_file_cache if cache is True else cache
+
+def _update_dict_from_key_value_file(d: dict, path: str, sep: str, strip: bool,
+                                     encoding: str|None, chunk_size: int,
+                                     fields: dict[str, Any]|None = None) -> dict:
+    """ Update d with the key-value-pairs read from path, block by block,
+    so that neither the whole file contents nor a list of all lines
+    are held in memory. Returns d. The numbers of bytes and lines read
+    are stored in fields (metrics), if given.
+    """
+    if encoding is None:
+        import locale
+        encoding = locale.getpreferredencoding(False)
+    decoder = codecs.getincrementaldecoder(encoding)()
+    splitter = _LineSplitter()
+    size = num_lines = 0
+    with open(path, "rb") as f:
+        while chunk := f.read(chunk_size):
+            size += len(chunk)
+            lines = splitter.feed(decoder.decode(chunk))
+            num_lines += len(lines)
+            _update_dict_from_lines(d, lines, sep, strip)
+    lines = splitter.feed(decoder.decode(b"", final=True)) + splitter.close()
+    num_lines += len(lines)
+    _update_dict_from_lines(d, lines, sep, strip)
+    if fields is not None:
+        fields["bytes"] = size
+        fields["lines"] = num_lines
+    return d
+
+def _read_key_value_file(path: str, sep: str, strip: bool, encoding: str|None,
+                         chunk_size: int, metrics: bool, signature: bool
+                         ) -> tuple[dict, dict[str, Any]|None, tuple[int, int, int]|None]:
+    """ Return the key-value-pairs read from path, the numbers of bytes
+    and lines read (if metrics is True) and the file_signature() taken
+    before reading (if signature is True). Runs in the executor of
+    update_dict_from_key_value_files(), whose workers don't share the
+    fields of the caller.
+    """
+    fields: dict[str, Any]|None = {} if metrics else None
+    file_sig = file_signature(path) if signature else None
+    return _update_dict_from_key_value_file({}, path, sep, strip, encoding,
+                                            chunk_size, fields), fields, file_sig
+
+@_observed("update_dict_from_key_value_file")
+def update_dict_from_key_value_file(d: dict|PathIndex, path: str, *,
             sep: str = "=", strip: bool = True,
             reraise_exc: bool = False, 
-            print_errors_to: SupportsWrite[str]|Logger|None = None) -> bool:
+            print_errors_to: SupportsWrite[str]|Logger|None = None,
+            encoding: str|None = None, chunk_size: int = 1 << 20,
+            cache: FileParseCache|bool|None = None) -> bool:
     """Read collection data from the given file. 
 
     The data must consist of lines of key-value-pairs
@@ -133,8 +417,11 @@ def update_dict_from_key_value_file(d: dict, path: str, *,
     Reraise an exception (e.g. FileNotFound) only if argument == True, 
     otherwise print exception information only.
 
+    The file is read and parsed block by block into a new dict, which
+    d is updated with at the end. If an error occurs, d remains unchanged.
+
     Args:
-        d (dict): dictionary to be updated
+        d (dict|PathIndex): dictionary to be updated
         path (str): file descriptor or path to open
         sep (str, optional): String to separate key from value. Defaults to "=".
         strip (bool, optional): Strip trailing and leading whitespace from keys and values? Defaults to True.
@@ -144,6 +431,13 @@ def update_dict_from_key_value_file(d: dict, path: str, *,
             i.e. error on opening file etc. Defaults to None.
             If of type SupportsWrite[str], print_errors_to will be passed to the print function as "file=" argument.
             If of type Logger, print_errors_to.error() will be called.
+        encoding (str|None, optional): encoding of the file, None for the
+            default encoding used by open(). Defaults to None.
+        chunk_size (int, optional): size of the blocks read in bytes. Defaults to 1 MiB.
+        cache (FileParseCache|bool|None, optional): cache for the parsed file, so that it
+            is parsed again only if it has changed. True for default_file_cache.
+            Reading an unchanged file then costs one os.stat() call (the values
+            are strings, so nothing needs to be copied). Defaults to None.
 
     Returns:
         bool: True on success, False otherwise
@@ -152,15 +446,22 @@ def update_dict_from_key_value_file(d: dict, path: str, *,
         Exception: FileNotFound (only if reraise_exc == True)
     """
     try:
-        with open(path) as f:
-            text: list[str] = f.read().splitlines()
-        for l in text:
-            parts = l.split(sep, 1)
-            if len(parts) == 2:
-                if strip:
-                    d[parts[0].strip()] = parts[1].strip()
-                else:
-                    d[parts[0]] = parts[1]
+        fields = _current()
+        file_cache = _file_cache(cache, path)
+        cache_key = ("key_value", sep, strip, encoding)
+        result = file_cache.lookup(path, cache_key) if file_cache is not None else None
+        if fields is not None:
+            fields["path"] = path
+            fields["cached"] = result is not None
+        if result is None:
+            signature = file_signature(path) if file_cache is not None else None
+            result = _update_dict_from_key_value_file({}, path, sep, strip, 
+                                                      encoding, chunk_size, fields)
+            if file_cache is not None and signature is not None:
+                file_cache.store(path, cache_key, signature, result)
+        if fields is not None:
+            fields["keys"] = len(result)
+        d.update(result)
         return True
     except Exception as exc:
         # reraise exception if raiseExc == True
@@ -168,59 +469,160 @@ def update_dict_from_key_value_file(d: dict, path: str, *,
             raise
         # else print error if requested to do so
         elif print_errors_to:
-            _print_error(traceback.format_exc(), target=print_errors_to)
+            _print_error(_format_exc(), target=print_errors_to)
+        return False
+
+@_observed("update_dict_from_key_value_files")
+def update_dict_from_key_value_files(d: dict|PathIndex, paths: Iterable[str], *,
+            sep: str = "=", strip: bool = True,
+            reraise_exc: bool = False, 
+            print_errors_to: SupportsWrite[str]|Logger|None = None,
+            encoding: str|None = None, chunk_size: int = 1 << 20,
+            cache: FileParseCache|bool|None = None,
+            executor: Executor|None = None) -> bool:
+    """Read collection data from several files concurrently. d is updated
+    in the order of paths, i.e. values from later files take precedence.
+    Files which can't be read are skipped.
+
+    For the arguments: see update_dict_from_key_value_file(). Files found
+    in cache are not read again. Additionally:
+
+    Args:
+        executor (Executor|None, optional): executor to read the files with, e.g.
+            a ProcessPoolExecutor for many large files. None for a thread pool
+            with one thread per file (up to 8). Defaults to None.
+
+    Raises:
+        Exception: FileNotFound etc. of the first file which can't be read
+            (only if reraise_exc == True; d remains unchanged then)
+
+    Returns:
+        bool: True, if all files could be read, False otherwise
+    """
+    try:
+        paths = list(paths)
+        fields = _current()
+        if fields is not None:
+            fields["files"] = len(paths)
+            for name in ("keys", "bytes", "lines", "cached"):
+                fields.setdefault(name, 0)
+        if executor is None:
+            from concurrent.futures import ThreadPoolExecutor
+            with ThreadPoolExecutor(max(1, min(8, len(paths)))) as own_executor:
+                return update_dict_from_key_value_files(
+                    d, paths, sep=sep, strip=strip, reraise_exc=reraise_exc, 
+                    print_errors_to=print_errors_to, encoding=encoding, 
+                    chunk_size=chunk_size, cache=cache, executor=own_executor)
+        cache_key = ("key_value", sep, strip, encoding)
+        # per file: its cache (if any) and its cached dict or the Future reading it
+        files: list[tuple[FileParseCache|None, dict|Future]|None] = []
+        for path in paths:
+            file_cache = _file_cache(cache, path)
+            result = file_cache.lookup(path, cache_key) if file_cache is not None else None
+            if result is not None:
+                files.append((file_cache, result))
+                if fields is not None:
+                    fields["cached"] += 1
+            else:
+                files.append((file_cache, executor.submit(
+                    _read_key_value_file, path, sep, strip, encoding, chunk_size,
+                    fields is not None, file_cache is not None)))
+        if reraise_exc:
+            for entry in files:
+                assert entry is not None
+                if not isinstance(entry[1], dict):
+                    exc = entry[1].exception()
+                    if exc is not None:
+                        raise exc
+        ok = True
+        for i, (path, entry) in enumerate(zip(paths, files)):
+            assert entry is not None
+            file_cache, cached_or_future = entry
+            try:
+                if isinstance(cached_or_future, dict):
+                    result = cached_or_future
+                else:
+                    result, counts, signature = cached_or_future.result()
+                    if file_cache is not None and signature is not None:
+                        file_cache.store(path, cache_key, signature, result)
+                    if fields is not None and counts:
+                        fields["bytes"] += counts["bytes"]
+                        fields["lines"] += counts["lines"]
+                if fields is not None:
+                    fields["keys"] += len(result)
+                d.update(result)
+            except Exception as exc:
+                ok = False
+                if print_errors_to:
+                    _print_error(_format_exc(), target=print_errors_to)
+            # release the file's dict as soon as it has been merged
+            files[i] = None
+        return ok
+    except Exception as exc:
+        # reraise exception if raiseExc == True
+        if reraise_exc:
+            raise
+        # else print error if requested to do so
+        elif print_errors_to:
+            _print_error(_format_exc(), target=print_errors_to)
         return False
 
-def dict_contains_path(nested_dict: dict, keypath: str, *, sep: str = ".") -> bool:
+def dict_contains_path(nested_dict: dict|PathIndex, keypath: str|KeyPath, *, sep: str = ".") -> bool:
     """ Tests if a given path is a valid key inside the given dict.
     It is assumed, that the key path elements are seperated by ".".
     To change this, use argument sep=...
 
     Args:
-        nested_dict (dict): (nested) dictionary to search in
-        keypath (str): key to be found (elements separated by sep)
+        nested_dict (dict|PathIndex): (nested) dictionary to search in. For a PathIndex,
+            the path is looked up in its index.
+        keypath (str|KeyPath): key to be found (elements separated by sep)
         sep (str, optional): key element separator to be used. Defaults to ".".
 
     Returns:
         bool: True if the key could be found, False otherwise
     """
-    # Split key path in first elements and all the rest
-    key_parts = keypath.split(sep, 1)
-    num_key_parts = len(key_parts)
-    if num_key_parts == 1:
-        # found single key. Test if it is in the dict:
-        return key_parts[0] in nested_dict
-    else:
-        # test for first key element. 
-        if key_parts[0] in nested_dict:
-            # if found, go one level deeper with the nested dict
-            # found at [key_parts[0]] und the rest of the key
-            dict_part = nested_dict[key_parts[0]]
-            return dict_contains_path(dict_part, key_parts[1], sep=sep)
-        else:
-            # if not found, there's no need to process
-            # the rest of the key
-            return False
+    if isinstance(nested_dict, PathIndex) and isinstance(keypath, str) and sep == nested_dict.sep:
+        return nested_dict.contains(keypath)
+    return compile_keypath(keypath, sep).contains(nested_dict)
 
-def update_dict_from_json_file(d: dict, file: str, *,
+@_observed("update_dict_from_json_file")
+def update_dict_from_json_file(d: dict|PathIndex, file: str, *,
                                mandatory_keys: list[str] = [], 
                                reraise_exc: bool = False,
-                               print_errors_to: SupportsWrite[str]|Logger|None = None) -> bool:
+                               print_errors_to: SupportsWrite[str]|Logger|None = None,
+                               cache: FileParseCache|bool|None = None,
+                               json_backend: str|JSONBackend|None = None,
+                               pause_gc: bool = False) -> bool:
     """ Read collection data from config file. Check for mandatory keys.
     Reraise an exception (e.g. FileNotFound) only if reraise_exc == True, 
     otherwise print exception information only if print_errors_to is not None.
 
     Args:
-        d (dict): dictionary to be updated
+        d (dict|PathIndex): dictionary to be updated
         file (str): file descriptor or path to open
         mandatory_keys (list[str], optional): check for these keys in the dict
-            If not found, return false and don't update dict. Defaults to [].
+            If not found, return false and don't update dict. All missing keys
+            are reported (see print_errors_to). Defaults to [].
         reraise_exc (bool, optional): reraise caught exceptions if True, otherwise
             print exception info if print_errors == True. Defaults to False.
         print_errors_to (SupportsWrite[str]|Logger, optional): stream or logger to print error information to, 
             i.e. missing mandatory keys, error on opening file etc. Defaults to None.
             If of type SupportsWrite[str], print_errors_to will be passed to the print function as "file=" argument.
             If of type Logger, print_errors_to.error() will be called.
+        cache (FileParseCache|bool|None, optional): cache for the parsed file and the 
+            result of the mandatory keys check, so that the file is parsed again
+            only if it has changed. True for default_file_cache. Note that 
+            default_file_cache (like any FileParseCache(copy=True)) copies the
+            nested dicts and lists of a cached result, which takes almost as long
+            as parsing. With FileParseCache(copy=False), reading an unchanged file
+            costs one os.stat() call, but the nested values put into d are shared
+            with the cache and must not be changed. Defaults to None.
+        json_backend (str|JSONBackend|None, optional): JSON decoder to use, e.g. "orjson".
+            See jsonbackends.set_json_backend(). None for the default set there.
+            Defaults to None.
+        pause_gc (bool, optional): disable the cyclic garbage collector while
+            decoding. This makes decoding large documents considerably faster,
+            but affects all threads of the process. Defaults to False.
 
     Returns:
         bool: True on success, False otherwise
@@ -228,23 +630,58 @@ def update_dict_from_json_file(d: dict, file: str, *,
 
     result = None
     try:
-        # read config file:
-        with open(file) as fp:
-            result = json.load(fp)
-
-        # check for mandatory keys:
-        for key in mandatory_keys:
-            if not dict_contains_path(result, key, sep="."):
-                if print_errors_to:
-                    cf = inspect.currentframe()
-                    if isinstance(cf, FrameType):
+        fields = _current()
+        file_cache = _file_cache(cache, file)
+        loads = get_json_backend(json_backend)
+        # results of different decoders may differ (e.g. parse_float=Decimal)
+        cache_key = ("json", loads)
+        # cached: [parsed file, {tuple of mandatory keys: missing keys}]
+        entry = file_cache.lookup(file, cache_key) if file_cache is not None else None
+        if fields is not None:
+            fields["path"] = file
+            fields["cached"] = entry is not None
+        if entry is None:
+            signature = file_signature(file) if file_cache is not None else None
+            # read config file (as bytes, the decoder handles UTF-8 itself):
+            with open(file, "rb") as fp:
+                data = fp.read()
+            if fields is not None:
+                fields["bytes"] = len(data)
+            if pause_gc:
+                with _gc_paused():
+                    entry = [loads(data), {}]
+            else:
+                entry = [loads(data), {}]
+            del data
+            if file_cache is not None and signature is not None:
+                file_cache.store(file, cache_key, signature, entry)
+        result, verdicts = entry
+
+        # check for mandatory keys (unless already done for this file):
+        # (all keys are checked in a single traversal of the parsed file)
+        mandatory = tuple(mandatory_keys)
+        missing: list[str]|None = verdicts.get(mandatory)
+        if missing is None:
+            missing = _compile_trie(mandatory, ".").missing(result) if mandatory else []
+            verdicts[mandatory] = missing
+        if missing:
+            if print_errors_to:
+                import inspect
+                cf = inspect.currentframe()
+                if isinstance(cf, FrameType):
+                    for key in missing:
                         _print_error(f"{cf.f_code.co_name}: "
                               f"missing key '{key}' in file '{file}'", 
                               target=print_errors_to)
-                return False
+            return False
 
         # update d only in case all mandatory keys could be found
-        d.update(result)
+        if fields is not None:
+            fields["keys"] = len(result)
+        if file_cache is not None and file_cache.copy:
+            d.update(_copy_containers(result))
+        else:
+            d.update(result)
         return True
     except Exception as exc:
         # reraise exception if raiseExc == True
@@ -252,5 +689,29 @@ def update_dict_from_json_file(d: dict, file: str, *,
             raise
         # else print error if requested to do so
         elif print_errors_to:
-            _print_error(traceback.format_exc(), target=print_errors_to)
+            _print_error(_format_exc(), target=print_errors_to)
         return False
+
+# names exported by "from collectiontools_vrb import *", including the lazily imported ones
+__all__ = [
+    # loader functions
+    "update_dict_from_url", "update_dict_from_urls",
+    "update_dict_from_url_async", "update_dict_from_urls_async",
+    "update_dict_from_key_value_file", "update_dict_from_key_value_files",
+    "update_dict_from_json_file", "dict_contains_path",
+    # collectiontranslator.py
+    "CollectionTranslator", "ContainerType", "ResolverCache", "TranslationIndex",
+    "TranslatedMapping", "TranslatedSequence", "CyclicReferenceError",
+    # filecache.py
+    "FileParseCache", "FileWatcher", "default_file_cache", "file_signature",
+    # jsonbackends.py
+    "JSONBackend", "register_json_backend", "set_json_backend", "get_json_backend",
+    "available_json_backends",
+    # keypath.py
+    "KeyPath", "KeyPathTrie", "PathIndex", "compile_keypath",
+    "get_path", "set_path", "delete_path",
+    # layered.py
+    "LayeredConfig",
+    # metrics.py
+    "Hook", "Histogram", "Stats", "add_hook", "remove_hook",
+] + list(_LAZY_NAMES)
@@ -0,0 +1,70 @@
+"""
+Helpers shared by the loader functions and classes of collectiontools_vrb.
+"""
+
+from __future__ import annotations
+
+import sys
+from typing import Iterable
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from _typeshed import SupportsWrite
+    from logging import Logger
+
+def _print_error(msg: str, target: SupportsWrite[str]|Logger):
+    # if target is a Logger, logging has been imported already
+    logging = sys.modules.get("logging")
+    if logging is not None and isinstance(target, logging.Logger):
+        target.error(msg)
+    else:
+        print(msg, file=target)
+
+def _format_exc() -> str:
+    """ Return traceback.format_exc(). traceback is imported only when needed. """
+    import traceback
+    return traceback.format_exc()
+
+def _update_dict_from_lines(d: dict, lines: Iterable[str], sep: str, strip: bool):
+    """ Update d with the key-value-pairs found in lines. Lines
+    not containing sep are ignored.
+    """
+    for l in lines:
+        parts = l.split(sep, 1)
+        if len(parts) == 2:
+            if strip:
+                d[parts[0].strip()] = parts[1].strip()
+            else:
+                d[parts[0]] = parts[1]
+
+# characters str.splitlines() splits at
+_LINE_BREAKS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+
+class _LineSplitter:
+    """ Split text arriving in pieces (e.g. decoded chunks of a 
+    download) into lines like str.splitlines() does for the 
+    whole text. A line spanning several pieces is returned
+    once it is complete.
+    """
+
+    def __init__(self):
+        self._tail = ""
+
+    def feed(self, text: str) -> list[str]:
+        """ Return the lines completed by text. """
+        if self._tail:
+            text = self._tail + text
+            self._tail = ""
+        lines = text.splitlines()
+        if text and text[-1] not in _LINE_BREAKS:
+            # the last line is incomplete
+            self._tail = lines.pop()
+        elif text.endswith("\r"):
+            # the line break may be the first half of "\r\n"
+            self._tail = lines.pop() + "\r"
+        return lines
+
+    def close(self) -> list[str]:
+        """ Return the last line, if it has not been returned yet. """
+        tail, self._tail = self._tail, ""
+        return tail.splitlines() if tail else []
@@ -1,18 +1,234 @@
-import re
-from typing import Any as Any
+from __future__ import annotations
 
-# [ ] Check implementation of translate_str()
+import copy, operator, re, threading, time
+from collections import OrderedDict, abc as _abc
+from functools import lru_cache
+from typing import Any as Any, Awaitable, Callable, Iterable, Mapping, NamedTuple
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+from collectiontools_vrb.keypath import compile_keypath
+from collectiontools_vrb.metrics import _hooks, _fields, _observed, _current, _timed_translator
+
+# default for key paths not found in translate_references()
+_NOT_FOUND: Any = object()
+
+class CyclicReferenceError(ValueError):
+    """ Raised by CollectionTranslator.translate_references(), if strings
+    reference each other in a cycle. Attribute cycle holds the paths
+    of the cycle, the first one repeated at its end.
+    """
+
+    def __init__(self, cycle: list[str]):
+        super().__init__(f"cyclic reference: {' -> '.join(cycle)}")
+        self.cycle = cycle
+
+class _Template:
+    """ Parsed form of a string with placeholders, as produced by
+    CollectionTranslator._tokenize(). literals holds the (already
+    unescaped) text between the placeholders, so there is always
+    one literal more than there are placeholders. placeholders holds
+    the placeholders as matched by the regular expression, keys holds
+    the corresponding names passed to the translator function.
+    """
+    __slots__ = ("literals", "placeholders", "keys")
+
+    def __init__(self, literals: tuple[str, ...], placeholders: tuple[str, ...]):
+        self.literals = literals
+        self.placeholders = placeholders
+        self.keys = tuple(m[1:-1] for m in placeholders)
+
+class ContainerType(NamedTuple):
+    """ Describes how CollectionTranslator traverses a container type.
+    See CollectionTranslator.register_container_type().
+    """
+    # returns (slot, value) pairs of the container, e.g. dict.items
+    items: Callable[[Any], Iterable[tuple[Any, Any]]]
+    # sets container[slot] = value in place, None for immutable containers
+    setitem: Callable[[Any, Any, Any], Any]|None = None
+    # returns a new container from the original one and a dict
+    # mapping slots to their new values (for immutable containers)
+    rebuild: Callable[[Any, dict[Any, Any]], Any]|None = None
+
+def _rebuild_tuple(t: tuple, changes: dict[int, Any]) -> tuple:
+    values = list(t)
+    for i, val in changes.items():
+        values[i] = val
+    if type(t) is tuple:
+        return tuple(values)
+    # named tuples
+    make = getattr(type(t), "_make", None)
+    return make(values) if make else type(t)(values)
+
+# types which are neither strings nor containers (those found in JSON data)
+_LEAF_TYPES = frozenset((int, float, bool, type(None)))
+
+def _translate_chunk(translator: CollectionTranslator, values: list,
+                     fields: dict[str, Any]|None = None) -> tuple[list, dict[str, Any]|None]:
+    # runs in the executor used by CollectionTranslator.translate_parallel().
+    # Worker threads and processes don't share the caller's context, so with
+    # metrics, the counters of the chunk are collected in fields (which makes
+    # translate() report nothing itself) and returned to the caller.
+    if fields is None:
+        return [translator.translate(val) for val in values], None
+    token = _fields.set(fields)
+    try:
+        return [translator.translate(val) for val in values], fields
+    finally:
+        _fields.reset(token)
+
+def _merge_into(target: Any, source: Any) -> Any:
+    """ Copy the values of the nested dicts and lists in source into
+    the corresponding containers in target, which keep their identity.
+    Returns target, or source if the two don't match structurally.
+    """
+    def mergeable(t: Any, s: Any) -> bool:
+        return (t is not s and type(t) is type(s) and isinstance(t, (dict, list))
+                and len(t) == len(s))
+    if not mergeable(target, source):
+        return source
+    seen: set[int] = set()
+    stack = [(target, source)]
+    while stack:
+        t, s = stack.pop()
+        if id(t) in seen:
+            continue
+        seen.add(id(t))
+        for slot, sval in (s.items() if isinstance(s, dict) else enumerate(s)):
+            tval = t[slot]
+            if mergeable(tval, sval):
+                stack.append((tval, sval))
+            elif tval is not sval:
+                t[slot] = sval
+    return target
+
+class ResolverCache:
+    """ Cache for the values a translator function returns for
+    placeholder names. Can be shared between several CollectionTranslator 
+    objects (see argument resolver_cache of CollectionTranslator) and
+    is thread safe.
+
+    The number of entries may be bounded (least recently used entries
+    are evicted first) and entries may expire after a given time.
+    hits and misses count the lookups done by resolve() and get().
+    """
+
+    def __init__(self, maxsize: int|None = 1024, ttl: float|None = None):
+        """ Construct new, empty ResolverCache object.
+
+        Args:
+            maxsize (int|None, optional): maximum number of entries. None 
+                for an unbounded cache. Defaults to 1024.
+            ttl (float|None, optional): time in seconds after which an entry
+                expires. None for entries which never expire. Defaults to None.
+        """
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        # key -> (value, expiry time or None)
+        self._entries: OrderedDict[str, tuple[str, float|None]] = OrderedDict()
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return self._lookup(key) is not None
+
+    def _lookup(self, key: str) -> tuple[str, float|None]|None:
+        # return entry for key, if present and not expired. Caller holds the lock.
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        if entry[1] is not None and entry[1] <= time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return entry
+
+    def get(self, key: str, default: str|None = None) -> str|None:
+        """ Return cached value for key or default, if key 
+        is not cached (or has expired).
+        """
+        with self._lock:
+            entry = self._lookup(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key: str, value: str):
+        """ Store value for key. Evict least recently used 
+        entries if maxsize is exceeded.
+        """
+        expires = None if self.ttl is None else time.monotonic() + self.ttl
+        with self._lock:
+            self._entries[key] = (value, expires)
+            self._entries.move_to_end(key)
+            if self.maxsize is not None:
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+
+    def resolve(self, key: str, func: Callable[[str], Any]) -> str:
+        """ Return cached value for key. If key is not cached, 
+        call func(key), store str() of the result and return it.
+        """
+        value = self.get(key)
+        if value is None:
+            # func is called without holding the lock, so that slow
+            # translator functions don't block other threads
+            value = str(func(key))
+            self.put(key, value)
+        return value
+
+    def __getstate__(self) -> dict[str, Any]:
+        # locks can't be pickled, each copy gets its own one
+        state = self.__dict__.copy()
+        del state["_lock"]
+        return state
+
+    def __setstate__(self, state: dict[str, Any]):
+        self.__dict__.update(state)
+        self._lock = threading.RLock()
+
+    def invalidate(self, keys: str|Iterable[str]|None = None):
+        """ Remove the given key or keys from the cache. 
+        Remove all entries if keys is None. The counters
+        hits and misses are not reset.
+        """
+        with self._lock:
+            if keys is None:
+                self._entries.clear()
+            else:
+                for key in [keys] if isinstance(keys, str) else keys:
+                    self._entries.pop(key, None)
 
 class CollectionTranslator:
     """ Search strings, lists or dicts for placeholders using 
     a regular expression provided by the user. Replace the 
     matches with a value provided by a translator function, 
     which is as well provided by the user.
-    For dicts and lists, the search is recursive.
+    For dicts, lists and tuples, the search is recursive. Further 
+    container types may be added using register_container_type().
     See constructor / functions for details.
     """
 
-    def __init__(self, translator_func = None, regexp: str = r"(?<!\\){[^{}]*}"):
+    # dispatch table for traversing containers, see register_container_type()
+    _container_types: dict[type, ContainerType] = {
+        dict: ContainerType(dict.items, operator.setitem),
+        list: ContainerType(enumerate, operator.setitem),
+        tuple: ContainerType(enumerate, None, _rebuild_tuple),
+    }
+
+    def __init__(self, translator_func = None, regexp: str = r"(?<!\\){[^{}]*}", *,
+                 template_cache_size: int|None = 1024,
+                 resolver_cache: ResolverCache|None = None,
+                 cache_per_call: bool = False):
         """ Construct new CollectionTranslator object with default regular expression.
 
         Args:
@@ -22,39 +238,303 @@ class CollectionTranslator:
                 placeholders. Defaults to r"(?<!\){[^{}]*}". That means
                 that placeholders are marked by surrounding curly brackets,
                 e.g. {KEY}.
+            template_cache_size (int|None, optional): number of parsed strings
+                to keep in the LRU cache of templates. None for an unbounded 
+                cache, 0 to disable caching. Defaults to 1024.
+            resolver_cache (ResolverCache|None, optional): cache for the values
+                returned by translator_func, kept across calls. Defaults to None.
+            cache_per_call (bool, optional): if True and resolver_cache is None,
+                translator_func is called only once per placeholder name within a 
+                single call of translate(), translate_dict() etc. Defaults to False.
         
         default regexp: a curly left bracket NOT preceded by a backslash starts
         a placeholder. It's name is denoted by the following sequence of characters
         NOT containing { or }. The end of the placeholder is a curly right bracket.
 
-        translator_func and regexp may be changed later by assigning new
-        values to self.translator_func and self.regexp
+        translator_func, regexp, resolver_cache and cache_per_call may be changed 
+        later by assigning new values to the attributes of the same name.
         """
-        self.regexp = regexp;
-        self.translator_func = translator_func;
+        self._template_cache_size = template_cache_size
+        self.regexp = regexp
+        self.translator_func = translator_func
+        self.resolver_cache = resolver_cache
+        self.cache_per_call = cache_per_call
+
+    def __getstate__(self) -> dict[str, Any]:
+        # the template cache can't be pickled (e.g. for process pools)
+        state = self.__dict__.copy()
+        del state["_parse"]
+        return state
 
-    def translate(self, val: Any) -> Any:
-        """ Convenience function which calls translate_dict, 
-        translate_list or translate_str, depending on the type of val.
-        For details: see these functions.
+    def __setstate__(self, state: dict[str, Any]):
+        self.__dict__.update(state)
+        self.regexp = self._regexp
+
+    @property
+    def regexp(self) -> str:
+        """ Regular expression for finding placeholders. Assigning a new
+        value compiles it and discards all cached templates.
+        """
+        return self._regexp
+
+    @regexp.setter
+    def regexp(self, regexp: str):
+        self._regexp = regexp
+        self._pattern = re.compile(regexp)
+        # a fresh cache per pattern: templates parsed with the old 
+        # pattern must not be reused
+        self._parse = lru_cache(maxsize=self._template_cache_size)(self._tokenize)
+
+    @staticmethod
+    def _unescape(s: str) -> str:
+        # replace \\{, \\}, \\/ by {, }, \
+        return s.replace("\\{", "{").replace("\\}", "}").replace("\\/", "\\")
+
+    def _tokenize(self, s: str) -> _Template:
+        """ Split s into literal text and placeholders in a single
+        scan. Used through the LRU cache self._parse().
+        """
+        literals: list[str] = []
+        placeholders: list[str] = []
+        pos = 0
+        for mo in self._pattern.finditer(s):
+            literals.append(self._unescape(s[pos:mo.start()]))
+            placeholders.append(mo.group())
+            pos = mo.end()
+        literals.append(self._unescape(s[pos:]))
+        return _Template(tuple(literals), tuple(placeholders))
+
+    def _resolver(self) -> Callable[[str], str]|None:
+        """ Return function mapping a placeholder name to its replacement
+        string for the duration of one call, taking into account 
+        self.resolver_cache and self.cache_per_call. None, if there
+        is no translator function.
+        """
+        func = self.translator_func
+        if not func:
+            return None
+        fields = _current() if _hooks else None
+        if fields is not None:
+            func = _timed_translator(func, fields)
+        resolve: Callable[[str], str]
+        cache = self.resolver_cache
+        if cache is not None:
+            resolve = lambda key: cache.resolve(key, func)
+        elif self.cache_per_call:
+            values: dict[str, str] = {}
+            def resolve_once(key: str) -> str:
+                try:
+                    return values[key]
+                except KeyError:
+                    value = values[key] = str(func(key))
+                    return value
+            resolve = resolve_once
+        else:
+            resolve = lambda key: str(func(key))
+        if fields is not None:
+            # count the placeholders replaced (metrics)
+            fields.setdefault("placeholders", 0)
+            uncounted = resolve
+            def resolve(key: str) -> str:
+                fields["placeholders"] += 1
+                return uncounted(key)
+        return resolve
+
+    def _render(self, template: _Template, resolve: Callable[[str], str]|None) -> str:
+        """ Join the literals of template with the values resolve() 
+        (see _resolver) provides for its placeholders.
+        """
+        literals = template.literals
+        if not template.keys:
+            return literals[0]
+        if resolve:
+            values = [resolve(k) for k in template.keys]
+        else:
+            # no translator function: leave placeholders unchanged
+            values = template.placeholders
+        parts = [literals[0]]
+        for val, lit in zip(values, literals[1:]):
+            parts.append(val)
+            parts.append(lit)
+        return "".join(parts)
+
+    def _translate_str_overridden(self) -> bool:
+        # True if a subclass overrides translate_str: it is then used
+        # for all strings, instead of rendering them directly
+        return type(self).translate_str is not CollectionTranslator.translate_str
+
+    def _renderer(self) -> Callable[[str], str]:
+        """ Return function translating a single string 
+        for the duration of one call.
+        """
+        if self._translate_str_overridden():
+            return self.translate_str
+        parse, render, resolve = self._parse, self._render, self._resolver()
+        return lambda s: render(parse(s), resolve)
+
+    @classmethod
+    def register_container_type(cls, container_type: type,
+                                items: Callable[[Any], Iterable[tuple[Any, Any]]],
+                                setitem: Callable[[Any, Any, Any], Any]|None = None,
+                                rebuild: Callable[[Any, dict[Any, Any]], Any]|None = None):
+        """ Make translate() and its relatives descend into containers 
+        of the given type (and its subclasses, unless registered separately).
+        Registering for a subclass of CollectionTranslator leaves
+        CollectionTranslator itself unchanged.
+
+        Args:
+            container_type (type): type of the container
+            items (Callable): function returning the (slot, value) pairs
+                of a container, e.g. dict.items or enumerate
+            setitem (Callable, optional): function setting container[slot] = value
+                in place, e.g. operator.setitem. Defaults to None.
+            rebuild (Callable, optional): for immutable containers: function called
+                with the original container and a dict mapping slots to new values,
+                returning the new container. Defaults to None.
+
+        Raises:
+            ValueError: if neither setitem nor rebuild is given
+        """
+        if setitem is None and rebuild is None:
+            raise ValueError(f"either setitem or rebuild is needed for {container_type}")
+        if "_container_types" not in cls.__dict__:
+            cls._container_types = dict(cls._container_types)
+        cls._container_types[container_type] = ContainerType(items, setitem, rebuild)
+
+    def _container_type(self, t: type) -> ContainerType|None:
+        """ Return dispatch table entry for type t or its closest base class. """
+        table = self._container_types
+        ctype = table.get(t)
+        if ctype is None and t not in _LEAF_TYPES:
+            for base in t.__mro__[1:]:
+                ctype = table.get(base)
+                if ctype is not None:
+                    break
+        return ctype
+
+    def _walk(self, root: Any, render: Callable[..., str], with_paths: bool = False,
+              inplace: bool = True) -> Any:
+        """ Translate all strings within root using render(). Instead of 
+        recursion, an explicit stack with one entry per nesting level is
+        used, so the nesting depth is not limited by the recursion limit.
+        If with_paths is True, render is called with the path of the
+        string as second argument, i.e. the tuple of slots (dict keys, 
+        list indices) leading from root to the string.
+
+        Mutable containers are changed in place, immutable containers are
+        rebuilt and replaced within their parent. If inplace is False, 
+        mutable containers are treated like immutable ones, but copied
+        (copy.copy) instead of rebuilt: only containers on the path to
+        a changed string are copied, all others are shared with root.
+        Containers referenced more than once (or recursively) are 
+        translated only once. To detect them, the ids of all containers
+        visited are kept during the walk, and the containers rebuilt or
+        copied together with their originals.
+
+        Returns:
+            Any: the translated root (root itself unless it is a string
+                 or an immutable container).
+        """
+        if isinstance(root, str):
+            return render(root, ()) if with_paths else render(root)
+        ctype = self._container_type(type(root))
+        if ctype is None:
+            return root
+        container_type = self._container_type
+        mutate = inplace
+        # ids of the containers visited. All of them remain reachable
+        # from root (or from replaced), so their ids are not reused
+        # during the walk.
+        visited: set[int] = {id(root)}
+        # id -> (container, its rebuilt or copied version), only for
+        # containers replaced; keeps the originals alive
+        replaced: dict[int, tuple[Any, Any]] = {}
+        # one frame per nesting level: 
+        # [container, ctype, iterator over items, changes, slot in parent]
+        stack: list[list[Any]] = [[root, ctype, iter(ctype.items(root)), None, None]]
+        # slots leading to the current frame (only if with_paths)
+        path: list[Any]|None = [] if with_paths else None
+        while True:
+            frame = stack[-1]
+            container, ctype, it = frame[0], frame[1], frame[2]
+            setitem = ctype.setitem if mutate else None
+            for slot, val in it:
+                if isinstance(val, str):
+                    new = render(val) if path is None else render(val, (*path, slot))
+                    if new is not val and new == val:
+                        # unchanged text, but another object (e.g. taken from
+                        # the template cache): keep val, so that its container
+                        # counts as unchanged
+                        new = val
+                elif (sub := container_type(type(val))) is None:
+                    continue
+                elif id(val) in visited:
+                    # shared (or recursive) container, already visited
+                    seen = replaced.get(id(val))
+                    if seen is None:
+                        continue
+                    new = seen[1]
+                else:
+                    # go down one level, continue with this frame afterwards
+                    visited.add(id(val))
+                    stack.append([val, sub, iter(sub.items(val)), None, slot])
+                    if path is not None:
+                        path.append(slot)
+                    break
+                if setitem is not None:
+                    setitem(container, slot, new)
+                elif new is not val:
+                    if frame[3] is None:
+                        frame[3] = {}
+                    frame[3][slot] = new
+            else:
+                # all items done: rebuild immutable container, if needed
+                stack.pop()
+                new = container
+                if frame[3]:
+                    if ctype.setitem is not None:
+                        # copy on write (inplace is False)
+                        new = copy.copy(container)
+                        for slot, val in frame[3].items():
+                            ctype.setitem(new, slot, val)
+                    else:
+                        new = ctype.rebuild(container, frame[3])
+                    replaced[id(container)] = (container, new)
+                if not stack:
+                    return new
+                if path is not None:
+                    path.pop()
+                if new is not container:
+                    parent = stack[-1]
+                    if mutate and parent[1].setitem is not None:
+                        parent[1].setitem(parent[0], frame[4], new)
+                    else:
+                        if parent[3] is None:
+                            parent[3] = {}
+                        parent[3][frame[4]] = new
+
+    @_observed("translate")
+    def translate(self, val: Any, *, inplace: bool = True) -> Any:
+        """ Convenience function which translates dicts, lists and
+        tuples (and other types registered using register_container_type) 
+        and strings. For details: see translate_dict, translate_list 
+        and translate_str.
 
         Args:
             val (_Any_): value to be translated
+            inplace (bool, optional): if False, val remains unchanged and a
+                translated version is returned, in which only the containers
+                on the paths to changed strings are new objects (shallow 
+                copies), while all other containers are shared with val.
+                Defaults to True.
 
         Returns:
-            any: return value of the above functions
+            any: translated value. Mutable containers are changed in 
+                place and returned (unless inplace is False), translated 
+                strings and tuples are new objects. Other values are 
+                returned unchanged.
         """
-        if isinstance(val, dict):
-            # recursivley go down to nested dict
-            val = self.translate_dict(val)
-        elif isinstance(val, list):
-            # recursivley go down to nested list
-            val = self.translate_list(val)
-        elif isinstance(val, str):
-            # replace placeholders, if possible
-            val = self.translate_str(val)
-        #else: don't change
-        return val
+        return self._walk(val, self._renderer(), inplace=inplace)
     
     # verwende eventuell str.format() für translate_str
     """
@@ -69,6 +549,291 @@ class CollectionTranslator:
     ->
     { "schlüssel" : "format string mit platzhaltern val0 und val1", ... }
     """
+    @_observed("translate_parallel")
+    def translate_parallel(self, val: Any, executor: Executor, *,
+                           chunk_size: int = 1000) -> Any:
+        """ Translate val like translate(), but split the entries of a 
+        top-level dict or list into chunks which are translated by 
+        the given executor. Other values are translated directly.
+
+        With a ThreadPoolExecutor (useful for I/O-bound translator functions),
+        the entries are translated in place. With a ProcessPoolExecutor 
+        (useful for CPU-bound translator functions), translated copies are 
+        returned by the worker processes and merged back, so that the 
+        dicts and lists of val keep their identity as with translate().
+        In that case, self (including translator_func and resolver_cache) must 
+        be picklable, and changes to a resolver_cache made in the worker 
+        processes are not visible afterwards.
+
+        Containers must not be shared between the top-level entries, 
+        since every chunk is translated separately.
+
+        Args:
+            val (Any): value to be translated
+            executor (Executor): e.g. concurrent.futures.ThreadPoolExecutor
+            chunk_size (int, optional): number of top-level entries translated
+                in one task. Defaults to 1000.
+
+        Returns:
+            Any: see translate()
+        """
+        if isinstance(val, dict):
+            slots: list[Any] = list(val)
+        elif isinstance(val, list):
+            slots = list(range(len(val)))
+        else:
+            return self.translate(val)
+        chunks = [slots[i:i + chunk_size] for i in range(0, len(slots), chunk_size)]
+        fields = _current() if _hooks else None
+        futures = [executor.submit(_translate_chunk, self, [val[slot] for slot in chunk],
+                                   None if fields is None else {})
+                   for chunk in chunks]
+        for chunk, future in zip(chunks, futures):
+            values, counts = future.result()
+            for slot, new in zip(chunk, values):
+                val[slot] = _merge_into(val[slot], new)
+            if fields is not None and counts:
+                for name, count in counts.items():
+                    fields[name] = fields.get(name, 0) + count
+        return val
+
+    def placeholder_keys(self, val: Any) -> set[str]:
+        """ Return the names of all placeholders found in val, 
+        which may be a string or a (nested) container. 
+        val remains unchanged.
+        """
+        keys: set[str] = set()
+        parse = self._parse
+        def collect(s: str) -> str:
+            keys.update(parse(s).keys)
+            return s
+        self._walk(val, collect)
+        return keys
+
+    @_observed("translate_async")
+    async def translate_async(self, val: Any,
+            async_translator_func: Callable[[str], Awaitable[Any]]|None = None, *,
+            batch_translator_func: Callable[[list[str]], Awaitable[Mapping[str, Any]]]|None = None,
+            max_concurrency: int = 10, inplace: bool = True) -> Any:
+        """ Translate val like translate(), but resolve the placeholders
+        asynchronously first: the names of all placeholders in val are
+        collected, then their values are fetched concurrently (or in a 
+        single batch), and finally all strings are rendered in one pass.
+
+        The values are fetched using batch_translator_func, if given, 
+        else using async_translator_func, else by calling self.translator_func
+        in worker threads. Names found in self.resolver_cache are not fetched
+        again, fetched values are stored there.
+
+        Args:
+            val (Any): value to be translated
+            async_translator_func (Callable, optional): coroutine function 
+                returning the value for a placeholder name. Defaults to None.
+            batch_translator_func (Callable, optional): coroutine function
+                called once with the list of placeholder names, returning 
+                a mapping from names to values. Not called if there are no
+                names to fetch. Defaults to None.
+            max_concurrency (int, optional): maximum number of concurrent calls
+                of async_translator_func or translator_func. Defaults to 10.
+            inplace (bool, optional): see translate(). Defaults to True.
+
+        Raises:
+            KeyError: if batch_translator_func returns no value for some names
+
+        Returns:
+            Any: see translate()
+        """
+        import asyncio
+        cache = self.resolver_cache
+        values: dict[str, str] = {}
+        missing: list[str] = []
+        for key in self.placeholder_keys(val):
+            cached = cache.get(key) if cache is not None else None
+            if cached is None:
+                missing.append(key)
+            else:
+                values[key] = cached
+        fields = _current() if _hooks else None
+        if batch_translator_func:
+            if missing:
+                if fields is not None:
+                    batch_translator_func = _timed_translator(batch_translator_func, fields,
+                                                              is_async=True)
+                fetched = await batch_translator_func(missing)
+                not_fetched = [key for key in missing if key not in fetched]
+                if not_fetched:
+                    raise KeyError(f"batch translator function returned no values for "
+                                   f"{', '.join(map(repr, sorted(not_fetched)))}")
+                values.update((key, str(fetched[key])) for key in missing)
+        elif async_translator_func or self.translator_func:
+            semaphore = asyncio.Semaphore(max_concurrency)
+            translator_func = self.translator_func
+            if fields is not None:
+                if async_translator_func:
+                    async_translator_func = _timed_translator(async_translator_func, fields,
+                                                              is_async=True)
+                else:
+                    translator_func = _timed_translator(translator_func, fields)
+            async def fetch(key: str):
+                async with semaphore:
+                    if async_translator_func:
+                        value = await async_translator_func(key)
+                    else:
+                        value = await asyncio.to_thread(translator_func, key)
+                values[key] = str(value)
+            await asyncio.gather(*(fetch(key) for key in missing))
+        else:
+            # nothing to resolve placeholders with: leave them unchanged
+            return self.translate(val, inplace=inplace)
+        if cache is not None:
+            for key in missing:
+                cache.put(key, values[key])
+        parse, render = self._parse, self._render
+        lookup = values.__getitem__
+        if fields is not None:
+            # count the placeholders replaced (metrics)
+            fields["placeholders"] = 0
+            def lookup(key: str) -> str:
+                fields["placeholders"] += 1
+                return values[key]
+        return self._walk(val, lambda s: render(parse(s), lookup), inplace=inplace)
+
+    def translate_lazy(self, val: Any) -> Any:
+        """ Return a read-only view of val, which translates each value
+        only when it is accessed (and only once). Use it to read a few
+        values out of large collections. val must not be changed while
+        the view is in use.
+
+        Args:
+            val (Any): value to be translated
+
+        Returns:
+            Any: TranslatedMapping for a mapping, TranslatedSequence for a
+                list or tuple, the translated string for a string, 
+                otherwise val itself.
+        """
+        return _lazy_view(val, self._renderer())
+
+    @_observed("translate_references")
+    def translate_references(self, val: Any, *, sep: str = ".", inplace: bool = True) -> Any:
+        """ Translate val like translate(), but resolve placeholders naming
+        a key path within val itself (e.g. "{paths.base}/logs" for
+        val["paths"]["base"]) to the translated value found there. Other
+        placeholders are resolved by translator_func as usual (or left
+        unchanged, if there is none).
+
+        References may be nested to any depth: the strings referenced are
+        translated first (in topological order, each only once), so a 
+        single call translates everything. Only paths through dicts (and
+        other mappings) leading to strings, numbers, booleans or None are
+        references; a path leading to a container is not.
+
+        Args:
+            val (Any): value to be translated
+            sep (str, optional): key element separator within placeholder
+                names. Defaults to ".".
+            inplace (bool, optional): see translate(). Defaults to True.
+
+        Raises:
+            CyclicReferenceError: if strings reference each other in a cycle
+
+        Returns:
+            Any: see translate()
+        """
+        parse, resolve = self._parse, self._resolver()
+        # path -> translated string referenced (or containing references)
+        resolved: dict[tuple, str] = {}
+        # placeholder name -> value, for placeholders not referencing strings
+        others: dict[str, str] = {}
+
+        def value_of(key: str, placeholder: str) -> str:
+            path = compile_keypath(key, sep)
+            value = resolved.get(path.parts)
+            if value is None:
+                value = others.get(key)
+                if value is None:
+                    target = path.get(val, _NOT_FOUND)
+                    if type(target) in _LEAF_TYPES:
+                        value = str(target)
+                    else:
+                        value = resolve(key) if resolve else placeholder
+                    others[key] = value
+            return value
+
+        def render(template: _Template) -> str:
+            literals = template.literals
+            parts = [literals[0]]
+            for key, placeholder, lit in zip(template.keys, template.placeholders, literals[1:]):
+                parts.append(value_of(key, placeholder))
+                parts.append(lit)
+            return "".join(parts)
+
+        def resolve_references(s: str, path: tuple) -> str:
+            # depth-first search through the strings referenced by s,
+            # rendering each after all strings it references.
+            # One frame per string: [path, template, index of next key]
+            if path in resolved or not parse(s).keys:
+                return s
+            stack: list[list[Any]] = [[path, parse(s), 0]]
+            # paths on the stack -> their position
+            active: dict[tuple, int] = {path: 0}
+            while stack:
+                frame = stack[-1]
+                keys = frame[1].keys
+                for i in range(frame[2], len(keys)):
+                    ref = compile_keypath(keys[i], sep)
+                    if ref.parts in resolved:
+                        continue
+                    target = ref.get(val, _NOT_FOUND)
+                    if not isinstance(target, str):
+                        continue
+                    if ref.parts in active:
+                        cycle = [f[0] for f in stack[active[ref.parts]:]] + [ref.parts]
+                        raise CyclicReferenceError([sep.join(map(str, p)) for p in cycle])
+                    frame[2] = i + 1
+                    active[ref.parts] = len(stack)
+                    stack.append([ref.parts, parse(target), 0])
+                    break
+                else:
+                    stack.pop()
+                    del active[frame[0]]
+                    resolved[frame[0]] = render(frame[1])
+            return s
+
+        # first pass: resolve the strings and what they reference,
+        # second pass: put the translated strings in place
+        self._walk(val, resolve_references, with_paths=True)
+        def translated(s: str, path: tuple) -> str:
+            value = resolved.get(path)
+            return render(parse(s)) if value is None else value
+        return self._walk(val, translated, with_paths=True, inplace=inplace)
+
+    @_observed("translate_indexed")
+    def translate_indexed(self, val: Any) -> TranslationIndex:
+        """ Translate val like translate() and remember which strings 
+        contain which placeholders. Using the returned index, strings
+        can be re-rendered after placeholder values have changed,
+        without walking val again (see TranslationIndex.retranslate).
+
+        Args:
+            val (Any): value to be translated
+
+        Returns:
+            TranslationIndex: index, its attribute root is the translated val
+        """
+        index = TranslationIndex(self)
+        parse, render, resolve = self._parse, self._render, self._resolver()
+        translate_str = self.translate_str if self._translate_str_overridden() else None
+        def render_indexed(s: str, path: tuple) -> str:
+            template = parse(s)
+            if template.keys:
+                index._add(path, s, template.keys)
+            if translate_str:
+                return translate_str(s)
+            return render(template, resolve)
+        index.root = self._walk(val, render_indexed, with_paths=True)
+        return index
+
     def translate_str(self, s: str) -> str:
         r""" Search s for placeholders using self.regexp and
         replace them with a value provided by self.translator_func.
@@ -89,6 +854,12 @@ class CollectionTranslator:
         "val: \\{{KEY}\\} \\/x /y" results in
         "{REPLACEMENT} ", followed by backslash-x, "/y"
 
+        A subclass may override translate_str(): translate(), translate_dict(),
+        translate_list(), translate_lazy(), translate_parallel() and
+        translate_indexed() then call it for every string. 
+        translate_async() and translate_references() look up the 
+        placeholder values themselves and don't use it.
+
         Args:
             s (str): String with placeholders in curly brackets
             func (_type_): function to get replacement for placeholder
@@ -97,72 +868,199 @@ class CollectionTranslator:
             str: String with replacements. s itself remains unchanged,
                  since strings are immutable.
         """
-        if self.translator_func:
-            # find and replace placeholders:
-            mo = re.findall(self.regexp, s)
-            for m in mo:
-                val = str(self.translator_func(m[1:-1]))
-                s = re.sub(m, val, s, 1)
-        # replace \\{, \\}, \\/ by {, }, \
-        s = re.sub(r"\\{", "{", s)
-        s = re.sub(r"\\}", "}", s)
-        s = re.sub(r"\\/", r"\\", s)
-        return s
+        if _hooks:
+            return self._translate_str_observed(s)
+        # s is scanned only once (see _tokenize) and the result is cached,
+        # rendering joins the literals and the replacement values
+        return self._render(self._parse(s), self._resolver())
+
+    @_observed("translate_str")
+    def _translate_str_observed(self, s: str) -> str:
+        # translate_str() with metrics, kept separate to keep translate_str() fast
+        return self._render(self._parse(s), self._resolver())
     
-    def translate_list(self, l: list) -> list:
+    @_observed("translate_list")
+    def translate_list(self, l: list, *, inplace: bool = True) -> list:
         """ Translate all entries in the given list. Depending on the 
-        type of the entry, self.translate_str, self.translate_list 
-        or self.translate_dict is called.
-        This combination of functions works recursively.
+        type of the entry, it is translated like in self.translate_str,
+        self.translate_list or self.translate_dict.
+        Nested containers are processed iteratively (see _walk), so deeply
+        nested data does not hit the recursion limit. Nested tuples are
+        replaced by translated copies.
         
-        The list items themselves are replaced by the translated versions.
+        The list items themselves are replaced by the translated versions,
+        unless inplace is False (see translate()).
 
         Args:
             l (list): List with items to be translated
+            inplace (bool, optional): see translate(). Defaults to True.
 
         Returns:
-            list: The (now changed) list itself.
-        """
-        # process all list items
-        for i in range(len(l)):
-            val = l[i]
-            if isinstance(val, dict):
-                # recursivley go down to nested dict
-                self.translate_dict(l[i])
-            elif isinstance(val, list):
-                # recursivley go down to nested list
-                self.translate_list(l[i])
-            elif isinstance(val, str):
-                # replace placeholders, if possible
-                l[i] = self.translate_str(val)
-            #else: ignore entry
-        return l
-
-    def translate_dict(self, d: dict) -> dict:
+            list: The (now changed) list itself, or its translated
+                version if inplace is False.
+        """
+        return self._walk(l, self._renderer(), inplace=inplace)
+
+    @_observed("translate_dict")
+    def translate_dict(self, d: dict, *, inplace: bool = True) -> dict:
         """ Translate all values in the given dict. Depending on the 
-        type of the value, self.translate_str, self.translate_list 
-        or self.translate_dict is called. The keys are left unchanged.
-        This combination of functions works recursively.
+        type of the value, it is translated like in self.translate_str,
+        self.translate_list or self.translate_dict. The keys are left unchanged.
+        Nested containers are processed iteratively (see _walk), so deeply
+        nested data does not hit the recursion limit. Nested tuples are
+        replaced by translated copies.
         
-        The dict values themselves are replaced by the translated versions.
+        The dict values themselves are replaced by the translated versions,
+        unless inplace is False (see translate()).
 
         Args:
             d (dict): dict with items to be translated
+            inplace (bool, optional): see translate(). Defaults to True.
 
         Returns:
-            list: The (now changed) dict itself.
-        """
-        # process whole dict
-        for key in d:
-            val = d[key]
-            if isinstance(val, dict):
-                # recursivley go down to nested dict
-                self.translate_dict(val)
-            elif isinstance(val, list):
-                # recursivley go down to nested list
-                self.translate_list(val)
-            elif isinstance(val, str):
-                # replace placeholders, if possible
-                d[key] = self.translate_str(val)
-            #else: ignore entry
-        return d
+            list: The (now changed) dict itself, or its translated
+                version if inplace is False.
+        """
+        return self._walk(d, self._renderer(), inplace=inplace)
+
+class TranslationIndex:
+    """ Returned by CollectionTranslator.translate_indexed(). Maps each
+    placeholder name to the paths of the strings referencing it and
+    keeps the original strings, so that retranslate() re-renders only
+    the strings affected by changed placeholder values.
+
+    A path is the tuple of slots (dict keys, list indices) leading from
+    root to a string. Containers on the path must support item access 
+    by their slots.
+    """
+
+    def __init__(self, translator: CollectionTranslator, root: Any = None):
+        """ Construct new, empty TranslationIndex object. 
+        Use CollectionTranslator.translate_indexed() instead.
+        """
+        self.translator = translator
+        self.root = root
+        # path -> original string
+        self.templates: dict[tuple, str] = {}
+        # placeholder name -> paths of strings containing it
+        self.paths: dict[str, set[tuple]] = {}
+
+    def _add(self, path: tuple, s: str, keys: Iterable[str]):
+        self.templates[path] = s
+        for key in keys:
+            self.paths.setdefault(key, set()).add(path)
+
+    def _set(self, path: tuple, value: Any):
+        # set value at path, rebuilding immutable containers on the way back up
+        containers = [self.root]
+        for slot in path[:-1]:
+            containers.append(containers[-1][slot])
+        for slot, container in zip(reversed(path), reversed(containers)):
+            ctype = self.translator._container_type(type(container))
+            if ctype is None:
+                raise TypeError(f"unable to set {slot!r} in {type(container)}")
+            if ctype.setitem is not None:
+                ctype.setitem(container, slot, value)
+                return
+            assert ctype.rebuild
+            value = ctype.rebuild(container, {slot: value})
+        self.root = value
+
+    @_observed("retranslate")
+    def retranslate(self, changed_keys: str|Iterable[str]) -> int:
+        """ Re-render all strings containing one of the given placeholders
+        from their original version. Cached values for these placeholders 
+        are removed from the translator's resolver_cache first.
+
+        Args:
+            changed_keys (str|Iterable[str]): placeholder name(s) whose values have changed
+
+        Returns:
+            int: number of strings re-rendered
+        """
+        keys = [changed_keys] if isinstance(changed_keys, str) else list(changed_keys)
+        if self.translator.resolver_cache is not None:
+            self.translator.resolver_cache.invalidate(keys)
+        affected: set[tuple] = set()
+        for key in keys:
+            affected.update(self.paths.get(key, ()))
+        render = self.translator._renderer()
+        for path in affected:
+            self._set(path, render(self.templates[path]))
+        return len(affected)
+
+def _lazy_view(val: Any, render: Callable[[str], str]) -> Any:
+    """ Return view of val for CollectionTranslator.translate_lazy(). """
+    if isinstance(val, str):
+        return render(val)
+    if isinstance(val, _abc.Mapping):
+        return TranslatedMapping(val, render)
+    if isinstance(val, (list, tuple)):
+        return TranslatedSequence(val, render)
+    return val
+
+# marker for values not rendered yet
+_NOT_RENDERED: Any = object()
+
+class TranslatedMapping(_abc.Mapping):
+    """ Read-only view of a mapping, returned by CollectionTranslator.translate_lazy().
+    A value is translated when it is accessed for the first time, nested
+    mappings, lists and tuples are wrapped in views themselves. Keys, 
+    iteration, len() and "in" don't translate anything.
+
+    The untranslated mapping is available as attribute data.
+    """
+
+    def __init__(self, data: Mapping, render: Callable[[str], str]):
+        """ Use CollectionTranslator.translate_lazy() instead. """
+        self.data = data
+        self._render = render
+        self._values: dict[Any, Any] = {}
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._values.get(key, _NOT_RENDERED)
+        if value is _NOT_RENDERED:
+            value = self._values[key] = _lazy_view(self.data[key], self._render)
+        return value
+
+    def __iter__(self):
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.data
+
+    def __repr__(self) -> str:
+        return f"TranslatedMapping({self.data!r})"
+
+class TranslatedSequence(_abc.Sequence):
+    """ Read-only view of a list or tuple, returned by 
+    CollectionTranslator.translate_lazy(). See TranslatedMapping.
+    """
+
+    def __init__(self, data: list|tuple, render: Callable[[str], str]):
+        """ Use CollectionTranslator.translate_lazy() instead. """
+        self.data = data
+        self._render = render
+        self._values: list[Any] = [_NOT_RENDERED] * len(data)
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self.data)))]
+        value = self._values[index]
+        if value is _NOT_RENDERED:
+            value = self._values[index] = _lazy_view(self.data[index], self._render)
+        return value
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (list, tuple, TranslatedSequence)):
+            return len(self) == len(other) and all(a == b for a, b in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"TranslatedSequence({self.data!r})"
@@ -0,0 +1,225 @@
+"""
+Cache parsed files, validated by os.stat(), and watch files for changes.
+"""
+
+from __future__ import annotations
+
+import marshal, os, threading
+from typing import Any as Any, Callable, Hashable
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from _typeshed import SupportsWrite
+    from logging import Logger
+
+from collectiontools_vrb._common import _print_error
+
+def file_signature(path: str) -> tuple[int, int, int]:
+    """ Return (st_mtime_ns, st_size, st_ino) of the given file.
+    Raises OSError (e.g. FileNotFoundError), if path can't be accessed.
+    """
+    st = os.stat(path)
+    return (st.st_mtime_ns, st.st_size, st.st_ino)
+
+def _copy_containers(val: Any) -> Any:
+    """ Return a deep copy of val, which is a result of json.load
+    or one of its values.
+    """
+    if not isinstance(val, (dict, list)):
+        return val
+    try:
+        # much faster than copy.deepcopy(), still faster than parsing again
+        return marshal.loads(marshal.dumps(val))
+    except ValueError:
+        # contains types not supported by marshal
+        if isinstance(val, dict):
+            return {k: _copy_containers(v) for k, v in val.items()}
+        return [_copy_containers(v) for v in val]
+
+class FileParseCache:
+    """ Cache for the results of parsing files, used by
+    update_dict_from_json_file() and update_dict_from_key_value_file(s)()
+    (see their argument cache). An entry is valid as long as the
+    (st_mtime_ns, st_size, st_ino) of its file remain unchanged,
+    so looking up an unchanged file costs one os.stat() call
+    (see argument copy of the constructor, though).
+
+    default_file_cache is a process-wide instance (with copy=True), which
+    is used when passing cache=True to the functions mentioned above.
+
+    hits and misses count the lookups of files.
+    """
+
+    def __init__(self, copy: bool = True):
+        """ Construct new, empty FileParseCache object.
+
+        Args:
+            copy (bool, optional): if True, update_dict_from_json_file() updates its
+                dict with copies of the nested dicts and lists of a cached result,
+                so that changes made to them (e.g. by CollectionTranslator) don't
+                affect the cache. Copying is only somewhat faster than parsing.
+                If False, they are shared with the cache and must not be changed,
+                and a lookup of an unchanged file costs one os.stat() call only.
+                Defaults to True.
+        """
+        self.copy = copy
+        self.hits = 0
+        self.misses = 0
+        # (path, key) -> (signature, value)
+        self._entries: dict[tuple[str, Hashable], tuple[tuple[int, int, int], Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, path: str, key: Hashable) -> Any|None:
+        """ Return the value stored for path and key (which denotes how the
+        file has been parsed), if the file has not changed since.
+        None otherwise.
+        """
+        entry_key = (os.path.abspath(path), key)
+        try:
+            signature = file_signature(path)
+        except OSError:
+            signature = None
+        with self._lock:
+            entry = self._entries.get(entry_key)
+            if entry is None or entry[0] != signature:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry[1]
+
+    def store(self, path: str, key: Hashable, signature: tuple[int, int, int], value: Any):
+        """ Store value for path and key. signature must have been
+        determined by file_signature() before reading the file.
+        """
+        with self._lock:
+            self._entries[(os.path.abspath(path), key)] = (signature, value)
+
+    def invalidate(self, path: str|None = None):
+        """ Remove all entries for path, or all entries if path is None. """
+        with self._lock:
+            if path is None:
+                self._entries.clear()
+            else:
+                path = os.path.abspath(path)
+                for entry_key in [k for k in self._entries if k[0] == path]:
+                    del self._entries[entry_key]
+
+default_file_cache = FileParseCache()
+
+class FileWatcher:
+    """ Poll files for changes and reload them using one of the
+    update_dict_from_... functions. Subscribers are notified with the
+    path and the newly loaded dict of each file which has changed
+    and could be loaded successfully.
+
+    Polling an unchanged file costs one os.stat() call. Use poll()
+    to check the files once, or start() to poll in a background thread.
+
+        watcher = FileWatcher()
+        watcher.watch("config.json", update_dict_from_json_file, mandatory_keys=["a.b"])
+        watcher.subscribe(lambda path, data: config.update(data))
+        watcher.start(interval=2.0)
+    """
+
+    def __init__(self, cache: FileParseCache|None = None,
+                 print_errors_to: SupportsWrite[str]|Logger|None = None):
+        """ Construct new FileWatcher object.
+
+        Args:
+            cache (FileParseCache|None, optional): cache passed to the loader
+                functions. None for default_file_cache. Defaults to None.
+            print_errors_to (SupportsWrite[str]|Logger, optional): stream or logger
+                to print error information to, passed to the loader functions and
+                used for exceptions raised by subscribers. Defaults to None.
+        """
+        self.cache = default_file_cache if cache is None else cache
+        self.print_errors_to = print_errors_to
+        # path -> (loader, loader kwargs, signature of last load)
+        self._files: dict[str, tuple[Callable[..., bool], dict[str, Any],
+                                     tuple[int, int, int]|None]] = {}
+        self._subscribers: list[Callable[[str, dict], Any]] = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread|None = None
+
+    def watch(self, path: str, loader: Callable[..., bool], **loader_kwargs):
+        """ Watch path, reload it with loader(d, path, **loader_kwargs) on
+        changes. The file is loaded on the next poll.
+
+        Args:
+            path (str): file to watch
+            loader (Callable[..., bool]): e.g. update_dict_from_json_file
+            loader_kwargs: further keyword arguments for loader
+        """
+        with self._lock:
+            self._files[path] = (loader, loader_kwargs, None)
+
+    def unwatch(self, path: str):
+        """ Stop watching path. """
+        with self._lock:
+            self._files.pop(path, None)
+
+    def subscribe(self, callback: Callable[[str, dict], Any]):
+        """ Call callback(path, data) for every file reloaded. """
+        self._subscribers.append(callback)
+
+    def unsubscribe(self, callback: Callable[[str, dict], Any]):
+        """ Remove callback from the subscribers. """
+        self._subscribers.remove(callback)
+
+    def poll(self) -> list[str]:
+        """ Check all watched files once, reload those which have changed
+        and notify the subscribers.
+
+        Returns:
+            list[str]: paths of the files reloaded successfully
+        """
+        with self._lock:
+            files = list(self._files.items())
+        reloaded = []
+        for path, (loader, kwargs, last_signature) in files:
+            try:
+                signature = file_signature(path)
+            except OSError:
+                signature = None
+            if signature is None or signature == last_signature:
+                continue
+            data: dict = {}
+            if not loader(data, path, cache=self.cache,
+                          print_errors_to=self.print_errors_to, **kwargs):
+                continue
+            with self._lock:
+                if path in self._files:
+                    self._files[path] = (loader, kwargs, signature)
+            reloaded.append(path)
+            for callback in list(self._subscribers):
+                try:
+                    callback(path, data)
+                except Exception as exc:
+                    if self.print_errors_to:
+                        _print_error(f"FileWatcher: subscriber {callback!r} failed "
+                                     f"for '{path}': {exc!r}", target=self.print_errors_to)
+        return reloaded
+
+    def start(self, interval: float = 1.0):
+        """ Poll every interval seconds in a background thread. """
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        def run():
+            while True:
+                self.poll()
+                if self._stop.wait(interval):
+                    break
+        self._thread = threading.Thread(target=run, name="FileWatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        """ Stop the background thread started by start(). """
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,136 @@
+"""
+Pluggable JSON decoders for update_dict_from_json_file().
+
+A backend is a function decoding a JSON document given as bytes.
+Backends for the standard library ("json") and for the optional
+packages orjson and ujson (used only if installed) are predefined.
+Further backends may be added using register_json_backend().
+"""
+
+from __future__ import annotations
+
+import gc, threading
+from contextlib import contextmanager
+from typing import Any as Any, Callable, Iterator
+
+JSONBackend = Callable[[bytes], Any]
+
+def _orjson_loads() -> JSONBackend:
+    import orjson
+    return orjson.loads
+
+def _ujson_loads() -> JSONBackend:
+    import ujson
+    return ujson.loads
+
+def _json_loads() -> JSONBackend:
+    import json
+    return json.loads
+
+# name -> function returning the decoder (raises ImportError if not installed)
+_backend_factories: dict[str, Callable[[], JSONBackend]] = {
+    "orjson": _orjson_loads,
+    "ujson": _ujson_loads,
+    "json": _json_loads,
+}
+# order in which "auto" tries the backends
+_auto_order = ["orjson", "ujson", "json"]
+# decoders already imported
+_backends: dict[str, JSONBackend] = {}
+_default_backend: str|JSONBackend = "json"
+
+def register_json_backend(name: str, loads: JSONBackend|Callable[[], JSONBackend], *,
+                          lazy: bool = False):
+    """ Register a JSON backend.
+
+    Args:
+        name (str): name of the backend
+        loads (Callable): function decoding bytes to a Python object, or
+            (if lazy is True) a function returning such a function. The latter
+            may raise ImportError, if the backend is not available.
+        lazy (bool, optional): see loads. Defaults to False.
+    """
+    _backends.pop(name, None)
+    _backend_factories[name] = loads if lazy else (lambda: loads)
+
+def available_json_backends() -> list[str]:
+    """ Return the names of all backends which can be used. """
+    names = []
+    for name in _backend_factories:
+        try:
+            _load_backend(name)
+        except ImportError:
+            continue
+        names.append(name)
+    return names
+
+def _load_backend(name: str) -> JSONBackend:
+    loads = _backends.get(name)
+    if loads is None:
+        loads = _backends[name] = _backend_factories[name]()
+    return loads
+
+def set_json_backend(backend: str|JSONBackend):
+    """ Set the backend used by update_dict_from_json_file() if
+    no backend is given there.
+
+    Args:
+        backend (str|JSONBackend): name of a registered backend, "auto" for the
+            first available of orjson, ujson and json, or a decoding function.
+            Defaults to "json" (the standard library).
+
+    Raises:
+        KeyError: if there is no backend of the given name
+    """
+    global _default_backend
+    if isinstance(backend, str) and backend != "auto" and backend not in _backend_factories:
+        raise KeyError(f"unknown JSON backend {backend!r}")
+    _default_backend = backend
+
+def get_json_backend(backend: str|JSONBackend|None = None) -> JSONBackend:
+    """ Return decoding function for backend (see set_json_backend()),
+    or for the default backend if backend is None. Falls back to the
+    standard library, if the requested backend is not installed.
+
+    Raises:
+        KeyError: if there is no backend of the given name
+    """
+    if backend is None:
+        backend = _default_backend
+    if callable(backend):
+        return backend
+    names = _auto_order if backend == "auto" else [backend]
+    for name in names:
+        try:
+            return _load_backend(name)
+        except ImportError:
+            continue
+    return _load_backend("json")
+
+_gc_lock = threading.Lock()
+_gc_pauses = 0
+_gc_was_enabled = False
+
+@contextmanager
+def _gc_paused() -> Iterator[None]:
+    """ Disable the cyclic garbage collector while decoding (see argument
+    pause_gc of update_dict_from_json_file()). JSON data contains no
+    reference cycles, but creating millions of containers triggers many
+    collections, which take a large part of the decoding time of big
+    documents. The collector is disabled for the whole process, i.e. 
+    for all threads. Nested uses (also in other threads) are counted,
+    the collector is re-enabled after the last one.
+    """
+    global _gc_pauses, _gc_was_enabled
+    with _gc_lock:
+        if _gc_pauses == 0:
+            _gc_was_enabled = gc.isenabled()
+            gc.disable()
+        _gc_pauses += 1
+    try:
+        yield
+    finally:
+        with _gc_lock:
+            _gc_pauses -= 1
+            if _gc_pauses == 0 and _gc_was_enabled:
+                gc.enable()
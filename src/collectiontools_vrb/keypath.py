@@ -0,0 +1,390 @@
+"""
+Compiled key paths into nested dicts, and batch checks of many key paths.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, MutableMapping
+from functools import lru_cache
+from typing import Any as Any, Hashable, Iterable, Iterator
+
+# marker for "no default given" / "key not found"
+_MISSING: Any = object()
+
+def _is_mapping(val: Any) -> bool:
+    return type(val) is dict or isinstance(val, Mapping)
+
+class KeyPath:
+    """ Key path into a nested dict, split into its elements once,
+    e.g. KeyPath("a.b.c") for d["a"]["b"]["c"]. Other separators may
+    be given with sep=..., or the elements directly as an iterable
+    (which allows for keys which are not strings or contain the separator).
+
+    Only dicts (and other Mappings) are traversed, so a path leading
+    through e.g. a list or a string does not exist.
+    """
+
+    __slots__ = ("parts", "sep")
+
+    def __init__(self, path: str|Iterable[Hashable], sep: str = "."):
+        """ Construct new KeyPath object.
+
+        Args:
+            path (str|Iterable[Hashable]): key elements separated by sep,
+                or the key elements themselves
+            sep (str, optional): key element separator. Defaults to ".".
+        """
+        self.parts: tuple[Hashable, ...] = (tuple(path.split(sep)) if isinstance(path, str)
+                                            else tuple(path))
+        self.sep = sep
+
+    def __str__(self) -> str:
+        return self.sep.join(map(str, self.parts))
+
+    def __repr__(self) -> str:
+        return f"KeyPath({str(self)!r})"
+
+    def __eq__(self, other: object) -> bool:
+        return isinstance(other, KeyPath) and self.parts == other.parts
+
+    def __hash__(self) -> int:
+        return hash(self.parts)
+
+    def __len__(self) -> int:
+        return len(self.parts)
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.parts)
+
+    def _parent(self, d: Mapping, create: bool = False) -> Any:
+        """ Return the dict containing the last key element, or _MISSING.
+        If create is True, missing intermediate dicts are created.
+        """
+        node: Any = d
+        for part in self.parts[:-1]:
+            if not _is_mapping(node):
+                return _MISSING
+            child = node.get(part, _MISSING)
+            if child is _MISSING and create:
+                child = node[part] = {}
+            node = child
+        return node if _is_mapping(node) else _MISSING
+
+    def contains(self, d: Mapping) -> bool:
+        """ Return True if the path exists in d. """
+        node: Any = d
+        for part in self.parts:
+            if not _is_mapping(node):
+                return False
+            node = node.get(part, _MISSING)
+            if node is _MISSING:
+                return False
+        return True
+
+    def get(self, d: Mapping, default: Any = _MISSING) -> Any:
+        """ Return the value at the path in d.
+
+        Raises:
+            KeyError: if the path does not exist and no default is given
+        """
+        node: Any = d
+        for part in self.parts:
+            node = node.get(part, _MISSING) if _is_mapping(node) else _MISSING
+            if node is _MISSING:
+                if default is _MISSING:
+                    raise KeyError(str(self))
+                return default
+        return node
+
+    def set(self, d: dict, value: Any, *, create: bool = True):
+        """ Set the value at the path in d.
+
+        Args:
+            d (dict): nested dict to change
+            value (Any): new value
+            create (bool, optional): create missing intermediate dicts. Defaults to True.
+
+        Raises:
+            KeyError: if an intermediate dict is missing (and create is False)
+                or an intermediate value is not a dict
+        """
+        parent = self._parent(d, create)
+        if parent is _MISSING:
+            raise KeyError(str(self))
+        parent[self.parts[-1]] = value
+
+    def delete(self, d: dict):
+        """ Delete the value at the path in d.
+
+        Raises:
+            KeyError: if the path does not exist
+        """
+        parent = self._parent(d)
+        if parent is _MISSING or self.parts[-1] not in parent:
+            raise KeyError(str(self))
+        del parent[self.parts[-1]]
+
+@lru_cache(maxsize=1024)
+def _compile(path: str, sep: str) -> KeyPath:
+    return KeyPath(path, sep)
+
+def compile_keypath(path: str|KeyPath, sep: str = ".") -> KeyPath:
+    """ Return KeyPath for path. Compiled paths are cached, so that
+    repeated calls with the same path string split it only once.
+    """
+    return path if isinstance(path, KeyPath) else _compile(path, sep)
+
+def get_path(d: Mapping, path: str|KeyPath, default: Any = _MISSING, *, sep: str = ".") -> Any:
+    """ Return the value at path (elements separated by sep) in d,
+    or default if it does not exist. See KeyPath.get().
+    """
+    if isinstance(d, PathIndex) and isinstance(path, str) and sep == d.sep:
+        return d.get_path(path, default)
+    return compile_keypath(path, sep).get(d, default)
+
+def set_path(d: dict|PathIndex, path: str|KeyPath, value: Any, *, sep: str = ".",
+             create: bool = True):
+    """ Set the value at path (elements separated by sep) in d. See KeyPath.set(). """
+    if isinstance(d, PathIndex) and isinstance(path, str) and sep == d.sep:
+        d.set_path(path, value, create=create)
+    else:
+        compile_keypath(path, sep).set(d, value, create=create)
+
+def delete_path(d: dict|PathIndex, path: str|KeyPath, *, sep: str = "."):
+    """ Delete the value at path (elements separated by sep) in d. See KeyPath.delete(). """
+    if isinstance(d, PathIndex) and isinstance(path, str) and sep == d.sep:
+        d.delete_path(path)
+    else:
+        compile_keypath(path, sep).delete(d)
+
+class PathIndex(MutableMapping):
+    """ Nested dict together with a flat index of all its key paths,
+    e.g. "db", "db.host" and "db.port" for {"db": {"host": ..., "port": ...}}.
+    contains() and get_path() look up a path with a single hash lookup
+    instead of walking the nested dicts.
+
+    At the top level, a PathIndex behaves like the dict it wraps, so it
+    can be passed to the update_dict_from_... functions, which keep the
+    index in sync:
+
+        config = PathIndex()
+        update_dict_from_json_file(config, "config.json")
+        if config.contains("db.pool.size"): ...
+
+    The index follows all changes made through the PathIndex (item
+    assignment, update(), set_path() etc.). After changing the nested 
+    dicts directly, call reindex(). Keys are converted to str and joined
+    with sep, so a key containing sep is indistinguishable from a path
+    (e.g. top-level key "a.b" and path "a" -> "b").
+    """
+
+    def __init__(self, data: dict|None = None, sep: str = "."):
+        """ Construct new PathIndex object.
+
+        Args:
+            data (dict|None, optional): nested dict to wrap (not copied).
+                None for a new, empty dict. Defaults to None.
+            sep (str, optional): key element separator. Defaults to ".".
+        """
+        self.data: dict = {} if data is None else data
+        self.sep = sep
+        # path -> value (leaf or nested dict)
+        self._flat: dict[str, Any] = {}
+        self.reindex()
+
+    def reindex(self):
+        """ Rebuild the index from scratch. """
+        self._flat.clear()
+        for key, value in self.data.items():
+            self._index(str(key), value)
+
+    def _index(self, path: str, value: Any):
+        flat, sep = self._flat, self.sep
+        stack = [(path, value)]
+        while stack:
+            path, value = stack.pop()
+            flat[path] = value
+            if isinstance(value, dict):
+                stack.extend((f"{path}{sep}{k}", v) for k, v in value.items())
+
+    def _unindex(self, path: str, value: Any):
+        flat, sep = self._flat, self.sep
+        stack = [(path, value)]
+        while stack:
+            path, value = stack.pop()
+            flat.pop(path, None)
+            if isinstance(value, dict):
+                stack.extend((f"{path}{sep}{k}", v) for k, v in value.items())
+
+    # MutableMapping interface (top-level keys)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        return self.data[key]
+
+    def __setitem__(self, key: Hashable, value: Any):
+        path = str(key)
+        old = self.data.get(key, _MISSING)
+        if old is not _MISSING:
+            self._unindex(path, old)
+        self.data[key] = value
+        self._index(path, value)
+
+    def __delitem__(self, key: Hashable):
+        self._unindex(str(key), self.data.pop(key))
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.data
+
+    def __repr__(self) -> str:
+        return f"PathIndex({self.data!r})"
+
+    def clear(self):
+        self.data.clear()
+        self._flat.clear()
+
+    # path interface
+
+    def paths(self) -> Iterator[str]:
+        """ Return an iterator over all indexed paths. """
+        return iter(self._flat)
+
+    def contains(self, path: str) -> bool:
+        """ Return True if path exists. """
+        return path in self._flat
+
+    def get_path(self, path: str, default: Any = _MISSING) -> Any:
+        """ Return the value (leaf or nested dict) at path.
+
+        Raises:
+            KeyError: if the path does not exist and no default is given
+        """
+        value = self._flat.get(path, default)
+        if value is _MISSING:
+            raise KeyError(path)
+        return value
+
+    def set_path(self, path: str, value: Any, *, create: bool = True):
+        """ Set the value at path, updating the index.
+
+        Args:
+            path (str): key elements separated by sep
+            value (Any): new value
+            create (bool, optional): create missing intermediate dicts. Defaults to True.
+
+        Raises:
+            KeyError: if an intermediate dict is missing (and create is False)
+                or an intermediate value is not a dict
+        """
+        parent_path, _, last = path.rpartition(self.sep)
+        if not parent_path:
+            self[last] = value
+            return
+        parent = self._flat.get(parent_path, _MISSING)
+        if parent is _MISSING and create:
+            self.set_path(parent_path, {})
+            parent = self._flat[parent_path]
+        if not isinstance(parent, dict):
+            raise KeyError(path)
+        old = parent.get(last, _MISSING)
+        if old is not _MISSING:
+            self._unindex(path, old)
+        parent[last] = value
+        self._index(path, value)
+
+    def delete_path(self, path: str):
+        """ Delete the value at path, updating the index.
+
+        Raises:
+            KeyError: if the path does not exist
+        """
+        parent_path, _, last = path.rpartition(self.sep)
+        if not parent_path:
+            del self[last]
+            return
+        parent = self._flat.get(parent_path)
+        if not isinstance(parent, dict) or last not in parent:
+            raise KeyError(path)
+        self._unindex(path, parent.pop(last))
+
+class _TrieNode:
+    __slots__ = ("children", "below")
+
+    def __init__(self):
+        self.children: dict[Hashable, _TrieNode] = {}
+        # indexes of the paths ending here or below
+        self.below: list[int] = []
+
+class KeyPathTrie:
+    """ Set of key paths, stored as a trie, so that common prefixes are
+    checked only once. Use it to check many paths at once:
+
+        trie = KeyPathTrie(["db.host", "db.port", "db.pool.size"])
+        missing = trie.missing(config)      # e.g. ["db.pool.size"]
+
+    Tries are immutable and may be reused for any number of dicts.
+    """
+
+    def __init__(self, paths: Iterable[str|KeyPath], sep: str = "."):
+        """ Construct new KeyPathTrie object.
+
+        Args:
+            paths (Iterable[str|KeyPath]): key paths (elements separated by sep)
+            sep (str, optional): key element separator. Defaults to ".".
+        """
+        self.paths: list[str|KeyPath] = list(paths)
+        self.sep = sep
+        self._root = _TrieNode()
+        for i, path in enumerate(self.paths):
+            node = self._root
+            node.below.append(i)
+            for part in compile_keypath(path, sep).parts:
+                child = node.children.get(part)
+                if child is None:
+                    child = node.children[part] = _TrieNode()
+                node = child
+                node.below.append(i)
+
+    def __len__(self) -> int:
+        return len(self.paths)
+
+    def missing(self, d: Mapping) -> list[str|KeyPath]:
+        """ Return all paths which do not exist in d, in the order given
+        to the constructor. d is traversed once; a missing key
+        accounts for all paths below it without looking at them.
+        For a PathIndex, each path is looked up in its index instead.
+        """
+        if isinstance(d, PathIndex) and d.sep == self.sep:
+            return [path for path in self.paths if not d.contains(str(path))]
+        missing: list[int] = []
+        stack: list[tuple[_TrieNode, Any]] = [(self._root, d)]
+        while stack:
+            node, val = stack.pop()
+            if not node.children:
+                continue
+            if not _is_mapping(val):
+                # paths ending here exist, the deeper ones don't
+                for child in node.children.values():
+                    missing.extend(child.below)
+                continue
+            for part, child in node.children.items():
+                sub = val.get(part, _MISSING)
+                if sub is _MISSING:
+                    missing.extend(child.below)
+                else:
+                    stack.append((child, sub))
+        missing.sort()
+        return [self.paths[i] for i in missing]
+
+    def contained_in(self, d: Mapping) -> bool:
+        """ Return True if all paths exist in d. """
+        return not self.missing(d)
+
+@lru_cache(maxsize=128)
+def _compile_trie(paths: tuple[str, ...], sep: str) -> KeyPathTrie:
+    return KeyPathTrie(paths, sep)
@@ -0,0 +1,246 @@
+"""
+Layered view of several nested dicts (e.g. defaults, file, URL and
+overrides), looked up without merging them.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any as Any, Awaitable, Callable, Hashable, Iterator
+
+from collectiontools_vrb.keypath import KeyPath, compile_keypath, _MISSING, _is_mapping
+
+# results of _lookup_in() for paths not found in a layer:
+# missing, or leading through a value which is not a dict
+_NOT_FOUND: Any = object()
+_HIDDEN: Any = object()
+
+def _lookup_in(layer: Mapping, parts: tuple[Hashable, ...]) -> Any:
+    # value at the path given by parts in layer, _NOT_FOUND or _HIDDEN
+    node: Any = layer
+    for part in parts:
+        if not _is_mapping(node):
+            return _HIDDEN
+        node = node.get(part, _NOT_FOUND)
+        if node is _NOT_FOUND:
+            break
+    return node
+
+def _merged(values: list[Any]) -> Any:
+    """ Merge the values found at the same path in several layers,
+    highest priority first: a non-mapping value hides all values below
+    it, nested mappings are merged key by key. A mapping found in a
+    single layer is returned as is, not copied.
+    """
+    mappings: list[Mapping] = []
+    for value in values:
+        if not _is_mapping(value):
+            if not mappings:
+                return value
+            break
+        mappings.append(value)
+    if len(mappings) == 1:
+        return mappings[0]
+    result: dict = {}
+    for key in dict.fromkeys(k for m in reversed(mappings) for k in m):
+        result[key] = _merged([m[key] for m in mappings if key in m])
+    return result
+
+class LayeredConfig(Mapping):
+    """ Read-only view of named layers of nested dicts, e.g. defaults,
+    a file, a URL and overrides. A value in a later layer overrides the
+    one at the same path in the earlier layers; nested dicts are merged
+    key by key (as with ChainMap, but nested and in reverse order):
+
+        config = LayeredConfig({"defaults": DEFAULTS})
+        config.load("file", update_dict_from_json_file, "config.json")
+        config.load("url", update_dict_from_url, "https://example.com/config")
+        config.set_layer("overrides", {"db": {"host": "localhost"}})
+        config.get_path("db.host")      # "localhost"
+        config["db"]                    # db of all layers merged
+
+    Each layer is loaded or replaced on its own, without merging the other
+    ones. Looked up values are cached. Setting, loading or removing a layer
+    discards only the cached values of paths contained in the old or the
+    new version of the layer. After changing a layer's dict directly, call
+    changed(). Values returned must not be changed.
+    """
+
+    def __init__(self, layers: Mapping[str, Mapping]|None = None, sep: str = "."):
+        """ Construct new LayeredConfig object.
+
+        Args:
+            layers (Mapping[str, Mapping]|None, optional): layer names and their
+                dicts (not copied), lowest priority first. Defaults to None.
+            sep (str, optional): key element separator. Defaults to ".".
+        """
+        self.sep = sep
+        # name -> dict, lowest priority first
+        self._layers: dict[str, Mapping] = dict(layers) if layers else {}
+        # key path elements -> value (or _NOT_FOUND)
+        self._cache: dict[tuple[Hashable, ...], Any] = {}
+        # key path elements -> cached paths below
+        self._below: dict[tuple[Hashable, ...], set[tuple[Hashable, ...]]] = {}
+
+    # layers
+
+    @property
+    def layer_names(self) -> list[str]:
+        """ Names of the layers, lowest priority first. """
+        return list(self._layers)
+
+    def layer(self, name: str) -> Mapping:
+        """ Return the dict of the given layer.
+
+        Raises:
+            KeyError: if there is no layer of that name
+        """
+        return self._layers[name]
+
+    def _invalidate(self, *layers: Mapping):
+        """ Discard the cached lookups of all paths existing in one of
+        layers, i.e. those which might be affected by adding or removing
+        these layers. All other lookups remain cached.
+        """
+        cache, below = self._cache, self._below
+        if not cache:
+            return
+        def drop(parts: tuple[Hashable, ...]):
+            if cache.pop(parts, _MISSING) is _MISSING:
+                return
+            for i in range(1, len(parts)):
+                paths = below.get(parts[:i])
+                if paths is not None:
+                    paths.discard(parts)
+                    if not paths:
+                        del below[parts[:i]]
+        stack: list[tuple[tuple[Hashable, ...], Mapping]] = [((), layer) for layer in layers]
+        while stack:
+            prefix, mapping = stack.pop()
+            for key, value in mapping.items():
+                parts = (*prefix, key)
+                drop(parts)
+                if _is_mapping(value):
+                    stack.append((parts, value))
+                else:
+                    # a value which is not a dict hides the paths below it
+                    for hidden in below.pop(parts, ()):
+                        drop(hidden)
+
+    def set_layer(self, name: str, data: Mapping):
+        """ Replace the dict of layer name by data (not copied). A new layer
+        is added with the highest priority.
+        """
+        old = self._layers.get(name)
+        self._layers[name] = data
+        if old is None:
+            self._invalidate(data)
+        else:
+            self._invalidate(old, data)
+
+    def remove_layer(self, name: str):
+        """ Remove layer name.
+
+        Raises:
+            KeyError: if there is no layer of that name
+        """
+        self._invalidate(self._layers.pop(name))
+
+    def changed(self):
+        """ Discard the cached lookups, after a layer's dict has been changed. """
+        self._cache.clear()
+        self._below.clear()
+
+    def load(self, name: str, loader: Callable[..., bool], *args: Any, **kwargs: Any) -> bool:
+        """ Load layer name using one of the update_dict_from_... functions
+        (or any function with the same calling convention), called as
+        loader(new_dict, *args, **kwargs). If it succeeds, the new dict
+        replaces the layer, otherwise the layer remains unchanged.
+
+        Returns:
+            bool: result of loader
+        """
+        data: dict = {}
+        result = loader(data, *args, **kwargs)
+        if result:
+            self.set_layer(name, data)
+        return result
+
+    async def load_async(self, name: str, loader: Callable[..., Awaitable[bool]],
+                         *args: Any, **kwargs: Any) -> bool:
+        """ Like load(), for update_dict_from_url_async() and
+        update_dict_from_urls_async().
+        """
+        data: dict = {}
+        result = await loader(data, *args, **kwargs)
+        if result:
+            self.set_layer(name, data)
+        return result
+
+    # lookups
+
+    def _lookup(self, parts: tuple[Hashable, ...]) -> Any:
+        value = self._cache.get(parts, _NOT_FOUND)
+        if value is _NOT_FOUND and parts not in self._cache:
+            # values found, highest priority first, up to the first one 
+            # hiding the others
+            found: list[Any] = []
+            for layer in reversed(self._layers.values()):
+                value = _lookup_in(layer, parts)
+                if value is _HIDDEN:
+                    break
+                if value is not _NOT_FOUND:
+                    found.append(value)
+                    if not _is_mapping(value):
+                        break
+            value = self._cache[parts] = _merged(found) if found else _NOT_FOUND
+            for i in range(1, len(parts)):
+                self._below.setdefault(parts[:i], set()).add(parts)
+        return value
+
+    def get_path(self, path: str|KeyPath, default: Any = _MISSING) -> Any:
+        """ Return the value at path (elements separated by sep), taken
+        from the highest layer containing it. Nested dicts found in
+        several layers are merged.
+
+        Raises:
+            KeyError: if no layer contains path and no default is given
+        """
+        value = self._lookup(compile_keypath(path, self.sep).parts)
+        if value is _NOT_FOUND:
+            if default is _MISSING:
+                raise KeyError(str(path))
+            return default
+        return value
+
+    def contains(self, path: str|KeyPath) -> bool:
+        """ Return True if path exists in any layer. """
+        return self._lookup(compile_keypath(path, self.sep).parts) is not _NOT_FOUND
+
+    def to_dict(self) -> dict:
+        """ Return all layers merged into a single dict (sharing nested
+        dicts found in a single layer only).
+        """
+        return {key: self[key] for key in self}
+
+    # Mapping interface (top-level keys)
+
+    def __getitem__(self, key: Hashable) -> Any:
+        value = self._cache.get((key,), _NOT_FOUND)
+        if value is _NOT_FOUND:
+            value = self._lookup((key,))
+            if value is _NOT_FOUND:
+                raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(dict.fromkeys(key for layer in self._layers.values() for key in layer))
+
+    def __len__(self) -> int:
+        return len(dict.fromkeys(key for layer in self._layers.values() for key in layer))
+
+    def __contains__(self, key: object) -> bool:
+        return any(key in layer for layer in self._layers.values())
+
+    def __repr__(self) -> str:
+        return f"LayeredConfig({self._layers!r})"
@@ -0,0 +1,274 @@
+"""
+Timings and counters of the loader functions and of CollectionTranslator,
+delivered to user-registered hooks.
+
+A hook is called as hook(event, fields) after each observed call, with
+event being the name of the function called (e.g. "update_dict_from_json_file")
+and fields a dict containing at least
+  - seconds: duration of the call
+  - ok: False, if the call failed (returned False or raised an exception)
+
+and depending on the event:
+  - path / url / urls / files: what has been read
+  - bytes, lines: amount of data read and number of lines parsed
+  - keys: number of keys read
+  - cached / not_modified: result taken from a FileParseCache / URLCache
+  - status: HTTP status (event "fetch", one per URL read by URLLoader)
+  - placeholders: number of placeholders replaced (translate... events)
+  - translator_calls: number of calls of the translator function
+  - key: placeholder name (event "resolve", one per call of the translator function)
+
+Only the outermost observed call of a thread (or asyncio task) is reported,
+e.g. update_dict_from_url() but not update_dict_from_urls() called by it.
+Events "fetch" and "resolve" are reported in any case.
+
+Stats is a hook aggregating the events, with latency histograms:
+
+    with Stats() as stats:
+        update_dict_from_json_file(d, "config.json")
+        translator.translate(d)
+    print(stats.summary())
+
+As long as no hook is registered, the overhead of the observed
+functions is a check of an empty list per call.
+"""
+
+from __future__ import annotations
+
+import functools, math, threading, time, warnings
+from contextvars import ContextVar
+from typing import Any as Any, Callable, TypeVar
+
+Hook = Callable[[str, dict[str, Any]], Any]
+
+# registered hooks. Checked for emptiness by the observed functions,
+# so it must only be changed in place.
+_hooks: list[Hook] = []
+# fields of the observed call currently running in this thread / task
+_fields: ContextVar[dict[str, Any]|None] = ContextVar("_fields", default=None)
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+# inspect.CO_COROUTINE (inspect is not imported, it takes long to import)
+_CO_COROUTINE = 0x80
+
+def add_hook(hook: Hook):
+    """ Call hook(event, fields) after each observed call. """
+    _hooks.append(hook)
+
+def remove_hook(hook: Hook):
+    """ Remove hook added by add_hook(). """
+    _hooks.remove(hook)
+
+def _emit(event: str, fields: dict[str, Any]):
+    for hook in list(_hooks):
+        try:
+            hook(event, fields)
+        except Exception as exc:
+            # a failing hook must not break the observed function
+            warnings.warn(f"metrics hook {hook!r} failed: {exc!r}", RuntimeWarning)
+
+def _current() -> dict[str, Any]|None:
+    """ Return the fields of the observed call running in this thread
+    or task, to be completed by the function observed. None, if there
+    is none (e.g. because no hook is registered).
+    """
+    return _fields.get()
+
+def _observed(event: str) -> Callable[[F], F]:
+    """ Decorator reporting calls of the decorated function (or coroutine
+    function) as event, if hooks are registered. A return value of
+    False counts as failure.
+    """
+    def decorator(func: F) -> F:
+        def finish(fields: dict[str, Any], start: float, result: Any):
+            fields["seconds"] = time.perf_counter() - start
+            fields["ok"] = result is not False
+            _emit(event, fields)
+
+        if func.__code__.co_flags & _CO_COROUTINE:
+            @functools.wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if not _hooks or _fields.get() is not None:
+                    return await func(*args, **kwargs)
+                fields: dict[str, Any] = {}
+                token = _fields.set(fields)
+                start, result = time.perf_counter(), False
+                try:
+                    result = await func(*args, **kwargs)
+                    return result
+                finally:
+                    _fields.reset(token)
+                    finish(fields, start, result)
+            return async_wrapper  # type: ignore
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not _hooks or _fields.get() is not None:
+                return func(*args, **kwargs)
+            fields: dict[str, Any] = {}
+            token = _fields.set(fields)
+            start, result = time.perf_counter(), False
+            try:
+                result = func(*args, **kwargs)
+                return result
+            finally:
+                _fields.reset(token)
+                finish(fields, start, result)
+        return wrapper  # type: ignore
+    return decorator
+
+def _timed_translator(func: Callable[[Any], Any], fields: dict[str, Any], *,
+                      is_async: bool = False) -> Callable[[Any], Any]:
+    """ Return func (a translator function, or coroutine function if
+    is_async), reporting each call as event "resolve" and counting the
+    calls in fields["translator_calls"]. func is called with a placeholder
+    name, or with a list of names (batch translator function).
+    """
+    lock = threading.Lock()
+    def report(arg: Any, start: float, ok: bool):
+        with lock:
+            fields["translator_calls"] = fields.get("translator_calls", 0) + 1
+        resolve_fields: dict[str, Any] = ({"keys": len(arg)} if isinstance(arg, list)
+                                          else {"key": arg})
+        resolve_fields["seconds"] = time.perf_counter() - start
+        resolve_fields["ok"] = ok
+        _emit("resolve", resolve_fields)
+
+    if is_async:
+        async def timed_async(arg: Any) -> Any:
+            start, ok = time.perf_counter(), False
+            try:
+                value = await func(arg)
+                ok = True
+                return value
+            finally:
+                report(arg, start, ok)
+        return timed_async
+
+    def timed(arg: Any) -> Any:
+        start, ok = time.perf_counter(), False
+        try:
+            value = func(arg)
+            ok = True
+            return value
+        finally:
+            report(arg, start, ok)
+    return timed
+
+class Histogram:
+    """ Histogram of durations with logarithmic buckets: the bucket of
+    a duration is the smallest power of 2 microseconds not less than it.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.min = math.inf
+        self.max = 0.0
+        # exponent -> count, the bucket's upper bound is 2**exponent µs
+        self.buckets: dict[int, int] = {}
+
+    def add(self, seconds: float):
+        """ Add a duration (in seconds). """
+        self.count += 1
+        self.total += seconds
+        self.min = min(self.min, seconds)
+        self.max = max(self.max, seconds)
+        micros = seconds * 1e6
+        exponent = math.frexp(micros)[1] if micros > 1 else 0
+        if micros > 1 and micros == 2 ** (exponent - 1):
+            # exact powers of 2 belong to the bucket they are the bound of
+            exponent -= 1
+        self.buckets[exponent] = self.buckets.get(exponent, 0) + 1
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+    def percentile(self, p: float) -> float:
+        """ Return an upper bound (in seconds) for the p-th percentile
+        (0 < p <= 100), i.e. the upper bound of its bucket.
+        """
+        if not self.count:
+            return 0.0
+        rank = math.ceil(self.count * p / 100)
+        seen = 0
+        for exponent in sorted(self.buckets):
+            seen += self.buckets[exponent]
+            if seen >= rank:
+                return min(2 ** exponent / 1e6, self.max)
+        return self.max
+
+    def summary(self) -> dict[str, Any]:
+        """ Return count, total, min, mean, p50, p90, p99 and max (in seconds)
+        and the buckets as {upper bound in seconds: count}.
+        """
+        return {"count": self.count, "total": self.total,
+                "min": self.min if self.count else 0.0, "mean": self.mean,
+                "p50": self.percentile(50), "p90": self.percentile(90),
+                "p99": self.percentile(99), "max": self.max,
+                "buckets": {2 ** e / 1e6: n for e, n in sorted(self.buckets.items())}}
+
+class Stats:
+    """ Hook aggregating the events per event name: number of calls and
+    failures, a Histogram of their durations, and the sums of the
+    numeric fields (bytes, lines, keys, placeholders etc.).
+
+    Use install() / uninstall() or use it as context manager to
+    register it as hook.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.calls: dict[str, int] = {}
+        self.failures: dict[str, int] = {}
+        self.latency: dict[str, Histogram] = {}
+        self.totals: dict[str, dict[str, int|float]] = {}
+
+    def __call__(self, event: str, fields: dict[str, Any]):
+        with self._lock:
+            self.calls[event] = self.calls.get(event, 0) + 1
+            if not fields.get("ok", True):
+                self.failures[event] = self.failures.get(event, 0) + 1
+            histogram = self.latency.get(event)
+            if histogram is None:
+                histogram = self.latency[event] = Histogram()
+            histogram.add(fields.get("seconds", 0.0))
+            totals = self.totals.setdefault(event, {})
+            for name, value in fields.items():
+                if name != "seconds" and type(value) in (int, float):
+                    totals[name] = totals.get(name, 0) + value
+
+    def install(self) -> Stats:
+        """ Register self as hook. Returns self. """
+        add_hook(self)
+        return self
+
+    def uninstall(self):
+        """ Remove self from the hooks. """
+        remove_hook(self)
+
+    def __enter__(self) -> Stats:
+        return self.install()
+
+    def __exit__(self, *exc_info):
+        self.uninstall()
+
+    def reset(self):
+        """ Discard all data collected so far. """
+        with self._lock:
+            self.calls.clear()
+            self.failures.clear()
+            self.latency.clear()
+            self.totals.clear()
+
+    def summary(self) -> dict[str, dict[str, Any]]:
+        """ Return {event: {"calls": ..., "failures": ..., "latency":
+        Histogram.summary(), "totals": {field: sum}}}.
+        """
+        with self._lock:
+            return {event: {"calls": calls, "failures": self.failures.get(event, 0),
+                            "latency": self.latency[event].summary(),
+                            "totals": dict(self.totals[event])}
+                    for event, calls in self.calls.items()}
@@ -0,0 +1,438 @@
+"""
+Load key-value data from URLs using a pooled aiohttp session.
+"""
+
+from __future__ import annotations
+
+from logging import Logger
+from typing import Any as Any, Iterable
+import aiohttp, asyncio, codecs, json, os, threading, time, traceback, ssl
+
+from typing import TYPE_CHECKING
+if TYPE_CHECKING:
+    from _typeshed import SupportsWrite
+    from collectiontools_vrb.keypath import PathIndex
+
+from collectiontools_vrb.metrics import _hooks, _emit, _current
+from collectiontools_vrb._common import _print_error, _update_dict_from_lines, _LineSplitter
+
+class URLCache:
+    """ Cache for the results of URLLoader, validated by HTTP conditional
+    requests: for each URL, the parsed key-value-pairs are stored together
+    with the ETag and Last-Modified headers of the response. When the
+    URL is read again, If-None-Match / If-Modified-Since are sent, and
+    on a 304 (Not Modified) answer the stored result is used without
+    downloading and parsing the body again.
+
+    The cache lives in memory and, if a path is given, is also saved 
+    to (and loaded from) a JSON file. URLLoader.update_dict_from_urls()
+    (and thus the update_dict_from_url... functions) saves it once
+    after reading all of its URLs, in a worker thread. After calling
+    URLLoader.fetch() directly, call save().
+
+    Statistics: 
+      - hits: number of conditional requests sent (URL found in cache)
+      - not_modified: number of 304 answers, i.e. cached results used
+      - misses: number of requests for URLs not found in the cache
+    """
+
+    def __init__(self, path: str|None = None):
+        """ Construct new URLCache object.
+
+        Args:
+            path (str|None, optional): JSON file to store the cache in. It is
+                loaded if it exists. None for a cache in memory only. 
+                Defaults to None.
+        """
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+        # url -> {"sep", "strip", "etag", "last_modified", "data"}
+        self._entries: dict[str, dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        # changed since loaded or saved?
+        self._dirty = False
+        # serializes writing the file
+        self._save_lock = threading.Lock()
+        if path is not None and os.path.exists(path):
+            with open(path, encoding="utf-8") as fp:
+                self._entries = json.load(fp)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> dict[str, int]:
+        """ hits, misses and not_modified as dict. """
+        return {"hits": self.hits, "misses": self.misses, 
+                "not_modified": self.not_modified}
+
+    def _lookup(self, url: str, sep: str, strip: bool) -> dict[str, Any]|None:
+        # return entry for url, if it has been parsed the same way
+        with self._lock:
+            entry = self._entries.get(url)
+            if entry is None or entry["sep"] != sep or entry["strip"] != strip:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return entry
+
+    def _store(self, url: str, sep: str, strip: bool, 
+               etag: str|None, last_modified: str|None, data: dict[str, str]):
+        with self._lock:
+            self._entries[url] = {"sep": sep, "strip": strip, "etag": etag,
+                                  "last_modified": last_modified, "data": data}
+            self._dirty = True
+
+    def invalidate(self, url: str|None = None):
+        """ Remove url from the cache, or all URLs if url is None. """
+        with self._lock:
+            if url is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(url, None)
+            self._dirty = True
+        self.save()
+
+    def save(self):
+        """ Write the cache to its file, if it has a path and has changed
+        since it was loaded or saved.
+        """
+        if self.path is None:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                text = json.dumps(self._entries)
+                self._dirty = False
+            # write to a temporary file first, so that the cache file
+            # is never left incomplete
+            try:
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, "w", encoding="utf-8") as fp:
+                    fp.write(text)
+                os.replace(tmp_path, self.path)
+            except BaseException:
+                self._dirty = True
+                raise
+
+def _encoding(response: aiohttp.ClientResponse) -> str:
+    """ Return the encoding of response, for a body not read by aiohttp. """
+    try:
+        return response.get_encoding()
+    except RuntimeError:
+        # no charset given: aiohttp can't guess without the body
+        return "utf-8"
+
+class URLLoader:
+    """ Reusable loader for key-value data from URLs. Keeps a single
+    aiohttp.ClientSession, so connections (and TLS sessions) are pooled
+    across calls, and fetches many URLs concurrently.
+
+    Use the async methods from within an event loop, preferably as
+    async context manager:
+
+        async with URLLoader() as loader:
+            await loader.update_dict_from_urls(d, urls)
+
+    From synchronous code, pass the loader to update_dict_from_url() or
+    update_dict_from_urls(). It then uses an event loop of its own, which
+    runs in a background thread. Use it as (sync) context manager or
+    call close_sync() when done:
+
+        with URLLoader() as loader:
+            update_dict_from_urls(d, urls, loader=loader)
+
+    The session is bound to the event loop it was created in, so a
+    loader must not be used from both synchronous and async code.
+    """
+
+    def __init__(self, *, sep: str = "=", strip: bool = True,
+                 ssl: bool|aiohttp.Fingerprint|ssl.SSLContext = True,
+                 limit: int = 100, limit_per_host: int = 10,
+                 timeout: float|None = 300.0,
+                 stream: bool = False, max_size: int|None = None,
+                 chunk_size: int = 65536, cache: URLCache|None = None):
+        """ Construct new URLLoader object. The session is created on first use.
+
+        Args:
+            sep (str, optional): String to separate key from value. Defaults to "=".
+            strip (bool, optional): Strip trailing and leading whitespace from keys
+                and values? Defaults to True.
+            ssl (bool|aiohttp.Fingerprint|ssl.SSLContext, optional): SSL validation mode.
+                See update_dict_from_url(). Defaults to True.
+            limit (int, optional): maximum number of simultaneous connections.
+                Defaults to 100.
+            limit_per_host (int, optional): maximum number of simultaneous connections
+                to the same host. Defaults to 10.
+            timeout (float|None, optional): timeout in seconds for a single request,
+                None for no timeout. Defaults to 300.0 (as aiohttp).
+            stream (bool, optional): parse the response while it is downloaded, 
+                chunk by chunk, instead of reading and decoding the whole body
+                first. Defaults to False.
+            max_size (int|None, optional): maximum size of a response body in bytes,
+                None for no limit. Responses announcing a larger Content-Length are
+                rejected before reading the body, the download of others is aborted
+                as soon as max_size is exceeded. Defaults to None.
+            chunk_size (int, optional): size of the chunks read in streaming mode
+                or if max_size is given. Defaults to 65536.
+            cache (URLCache|None, optional): cache for conditional requests. 
+                Defaults to None.
+        """
+        self.sep = sep
+        self.strip = strip
+        self.ssl = ssl
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = timeout
+        self.stream = stream
+        self.max_size = max_size
+        self.chunk_size = chunk_size
+        self.cache = cache
+        self._session: aiohttp.ClientSession|None = None
+        self._session_loop: asyncio.AbstractEventLoop|None = None
+        # event loop running in a background thread, for synchronous use
+        self._loop: asyncio.AbstractEventLoop|None = None
+        self._thread: threading.Thread|None = None
+        self._lock = threading.Lock()
+
+    async def __aenter__(self) -> URLLoader:
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    def __enter__(self) -> URLLoader:
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close_sync()
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        """ Return the session, create it if necessary. Must be
+        called from within the event loop the session belongs to.
+        """
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(ssl=self.ssl, limit=self.limit,
+                                               limit_per_host=self.limit_per_host),
+                timeout=aiohttp.ClientTimeout(total=self.timeout))
+            self._session_loop = loop
+        elif self._session_loop is not loop:
+            raise RuntimeError("URLLoader is bound to a different event loop")
+        return self._session
+
+    async def fetch(self, url: str, *, sep: str|None = None,
+                    strip: bool|None = None) -> dict[str, str]:
+        """ Read key-value-pairs from the given URL into a new dict.
+        Reported as event "fetch" to the hooks of metrics.py, if any.
+        self.cache is not saved (see URLCache.save()).
+
+        Args:
+            url (str): URL to read from
+            sep (str|None, optional): overrides self.sep. Defaults to None.
+            strip (bool|None, optional): overrides self.strip. Defaults to None.
+
+        Raises:
+            Exception: if URL can not be read properly
+
+        Returns:
+            dict[str, str]: key-value-pairs read
+        """
+        if not _hooks:
+            return await self._fetch(url, sep, strip, None)
+        fields: dict[str, Any] = {"url": url, "bytes": 0, "lines": 0, "keys": 0,
+                                  "status": None, "not_modified": False}
+        start, ok = time.perf_counter(), False
+        try:
+            d = await self._fetch(url, sep, strip, fields)
+            fields["keys"] = len(d)
+            ok = True
+            return d
+        finally:
+            fields["seconds"] = time.perf_counter() - start
+            fields["ok"] = ok
+            _emit("fetch", fields)
+
+    async def _fetch(self, url: str, sep: str|None, strip: bool|None,
+                     fields: dict[str, Any]|None) -> dict[str, str]:
+        """ See fetch(). Stores status, bytes and lines in fields, if given. """
+        d: dict[str, str] = {}
+        sep = self.sep if sep is None else sep
+        strip = self.strip if strip is None else strip
+        cache = self.cache
+        entry = cache._lookup(url, sep, strip) if cache is not None else None
+        headers: dict[str, str] = {}
+        if entry is not None:
+            if entry["etag"]:
+                headers["If-None-Match"] = entry["etag"]
+            if entry["last_modified"]:
+                headers["If-Modified-Since"] = entry["last_modified"]
+        async with self._get_session().get(url, headers=headers) as response:
+            if fields is not None:
+                fields["status"] = response.status
+            if response.status == 304 and entry is not None:
+                assert cache is not None
+                cache.not_modified += 1
+                if fields is not None:
+                    fields["not_modified"] = True
+                return dict(entry["data"])
+            if not response.ok:
+                raise Exception(
+                    f"Unable to read from URL {url}. Status {response.status}")
+            max_size = self.max_size
+            if max_size is not None and (response.content_length or 0) > max_size:
+                raise Exception(
+                    f"Response from URL {url} exceeds {max_size} bytes")
+            if self.stream:
+                await self._parse_stream(d, url, response, sep, strip, fields)
+            else:
+                if max_size is None:
+                    body = await response.read()
+                    text: str = await response.text()
+                else:
+                    # without Content-Length: stop reading once max_size is exceeded
+                    body = await self._read_limited(url, response, max_size)
+                    text = body.decode(_encoding(response))
+                lines = text.splitlines()
+                if fields is not None:
+                    fields["bytes"] = len(body)
+                    fields["lines"] = len(lines)
+                _update_dict_from_lines(d, lines, sep, strip)
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+        if cache is not None and (etag or last_modified):
+            cache._store(url, sep, strip, etag, last_modified, dict(d))
+        return d
+
+    async def _read_limited(self, url: str, response: aiohttp.ClientResponse,
+                            max_size: int) -> bytes:
+        """ Return the response body, reading it chunk by chunk.
+        Raises an exception as soon as it exceeds max_size bytes.
+        """
+        chunks: list[bytes] = []
+        size = 0
+        async for chunk in response.content.iter_chunked(self.chunk_size):
+            size += len(chunk)
+            if size > max_size:
+                raise Exception(
+                    f"Response from URL {url} exceeds {max_size} bytes")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def _parse_stream(self, d: dict, url: str, response: aiohttp.ClientResponse,
+                            sep: str, strip: bool, fields: dict[str, Any]|None = None):
+        """ Update d with the key-value-pairs of the response body, 
+        decoding and parsing it chunk by chunk while it is downloaded.
+        Stores bytes and lines read in fields, if given.
+        """
+        decoder = codecs.getincrementaldecoder(_encoding(response))()
+        splitter = _LineSplitter()
+        size = num_lines = 0
+        async for chunk in response.content.iter_chunked(self.chunk_size):
+            size += len(chunk)
+            if self.max_size is not None and size > self.max_size:
+                raise Exception(
+                    f"Response from URL {url} exceeds {self.max_size} bytes")
+            lines = splitter.feed(decoder.decode(chunk))
+            num_lines += len(lines)
+            _update_dict_from_lines(d, lines, sep, strip)
+        lines = splitter.feed(decoder.decode(b"", final=True)) + splitter.close()
+        _update_dict_from_lines(d, lines, sep, strip)
+        if fields is not None:
+            fields["bytes"] = size
+            fields["lines"] = num_lines + len(lines)
+
+    async def update_dict_from_urls(self, d: dict|PathIndex, urls: Iterable[str], *,
+            sep: str|None = None, strip: bool|None = None,
+            reraise_exc: bool = False,
+            print_errors_to: SupportsWrite[str]|Logger|None = None) -> bool:
+        """ Read key-value-pairs from all the given URLs concurrently and
+        update d with them in the order of urls, i.e. values from later
+        URLs take precedence. URLs which can't be read are skipped.
+        Afterwards, self.cache is saved (see URLCache.save()).
+
+        Args:
+            d (dict|PathIndex): dictionary to be updated
+            urls (Iterable[str]): URLs to read from
+            sep (str|None, optional): overrides self.sep. Defaults to None.
+            strip (bool|None, optional): overrides self.strip. Defaults to None.
+            reraise_exc (bool, optional): reraise the first exception caught
+                (d remains unchanged then), otherwise print exception info if
+                print_errors_to is not None. Defaults to False.
+            print_errors_to (SupportsWrite[str]|Logger, optional): stream or logger to
+                print error information to. See update_dict_from_url(). Defaults to None.
+
+        Raises:
+            Exception: if a URL can not be read properly (only if reraise_exc == True)
+
+        Returns:
+            bool: True, if all URLs could be read, False otherwise
+        """
+        results = await asyncio.gather(
+            *(self.fetch(url, sep=sep, strip=strip) for url in urls),
+            return_exceptions=True)
+        fields = _current()
+        if fields is not None:
+            fields["urls"] = len(results)
+            fields["keys"] = sum(len(result) for result in results
+                                 if not isinstance(result, BaseException))
+        if self.cache is not None:
+            # once per call, without blocking the event loop
+            try:
+                await asyncio.to_thread(self.cache.save)
+            except Exception as exc:
+                results.append(exc)
+        if reraise_exc:
+            for result in results:
+                if isinstance(result, BaseException):
+                    raise result
+        ok = True
+        for result in results:
+            if isinstance(result, BaseException):
+                ok = False
+                if print_errors_to:
+                    _print_error("".join(traceback.format_exception(
+                        type(result), result, result.__traceback__)),
+                        target=print_errors_to)
+            else:
+                d.update(result)
+        return ok
+
+    async def close(self):
+        """ Close the session. Must be called from within the event
+        loop the session belongs to. The loader may be used again
+        afterwards and then creates a new session.
+        """
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+            self._session_loop = None
+
+    def run(self, coro):
+        """ Run coroutine coro in the loader's background event loop
+        (started on first use) and return its result.
+        """
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever,
+                                                name="URLLoader", daemon=True)
+                self._thread.start()
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def close_sync(self):
+        """ Close the session and stop the background event loop, if
+        the loader has been used from synchronous code.
+        """
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is not None and thread is not None:
+            asyncio.run_coroutine_threadsafe(self.close(), loop).result()
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join()
+            loop.close()
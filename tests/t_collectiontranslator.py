@@ -3,7 +3,7 @@ Sample usage of CollectionTranslator from collectiontranslator.py
 """
 
 import json
-from collectiontools_vrb import CollectionTranslator
+from collectiontools_vrb import CollectionTranslator, ResolverCache
 
 ######################################
 # SAMPLE USAGE: CollectionTranslator
@@ -22,3 +22,192 @@ t.translate_dict(j)
 print("====== Translated Version ==============================")
 print(json.dumps(j, indent=4))
 
+
+######################################
+# SAMPLE USAGE: ResolverCache
+######################################
+
+# count the calls of the translator function
+calls: list[str] = []
+def counting_func(s: str) -> str:
+    calls.append(s)
+    return some_func(s)
+
+cache = ResolverCache(maxsize=100)
+t = CollectionTranslator(counting_func, resolver_cache=cache)
+for _ in range(3):
+    with open("tests/collection_translator_sample.json") as fp:
+        t.translate_dict(json.load(fp))
+print("====== ResolverCache ===================================")
+print(f"translator calls: {len(calls)}, hits: {cache.hits}, misses: {cache.misses}")
+# one call per distinct placeholder, all other lookups are hits
+assert len(calls) == len(set(calls)) == cache.misses
+# after invalidation, the translator function is called again
+cache.invalidate("key_in_str")
+t.translate_str("{key_in_str}")
+assert calls[-1] == "key_in_str"
+
+######################################
+# SAMPLE USAGE: deeply nested data, tuples
+######################################
+
+# nesting far beyond the recursion limit
+deep: dict = {}
+node = deep
+for _ in range(50000):
+    node["next"] = {"val": "{deep_key}", "pair": ("{first}", 2)}
+    node = node["next"]
+t = CollectionTranslator(some_func)
+t.translate_dict(deep)
+print("====== Deeply nested data ==============================")
+print(deep["next"]["val"], deep["next"]["pair"])
+assert node is not deep and deep["next"]["val"] == "[DEEP_KEY]"
+assert deep["next"]["pair"] == ("[FIRST]", 2)
+
+######################################
+# SAMPLE USAGE: translate_indexed / retranslate
+######################################
+
+values = {"key_in_str": "first", "key_in_list": "second"}
+t = CollectionTranslator(lambda s: values.get(s, s))
+with open("tests/collection_translator_sample.json") as fp:
+    j = json.load(fp)
+index = t.translate_indexed(j)
+# change one value and re-render only the strings containing it
+values["key_in_str"] = "changed"
+n = index.retranslate("key_in_str")
+print("====== Retranslated Version ============================")
+print(json.dumps(j, indent=4))
+assert n == 1 and j["key"].startswith("val: {changed}")
+assert j["list"][0] == "some_text_again" + values["key_in_list"] + "\\"
+
+######################################
+# SAMPLE USAGE: translate_parallel
+######################################
+
+from concurrent.futures import ThreadPoolExecutor
+
+big = {f"entry{i}": {"text": f"{{key{i % 10}}}", "list": ["{other}", i]} 
+       for i in range(10000)}
+first_entry = big["entry0"]
+with ThreadPoolExecutor(4) as executor:
+    CollectionTranslator(some_func).translate_parallel(big, executor, chunk_size=500)
+print("====== translate_parallel ==============================")
+print(big["entry1"])
+assert big["entry0"] is first_entry and big["entry1"]["text"] == "[KEY1]"
+
+######################################
+# SAMPLE USAGE: translate_async
+######################################
+
+import asyncio, time
+
+async def some_async_func(s: str) -> str:
+    # e.g. a network lookup
+    await asyncio.sleep(0.1)
+    return some_func(s)
+
+with open("tests/collection_translator_sample.json") as fp:
+    j = json.load(fp)
+start = time.perf_counter()
+asyncio.run(CollectionTranslator().translate_async(j, some_async_func))
+elapsed = time.perf_counter() - start
+print("====== translate_async =================================")
+print(f"{j['dict']} after {elapsed:.2f}s")
+# all placeholders are resolved concurrently
+assert elapsed < 0.3 and j["dict"]["val2"] == "some_text[KEY_IN_DICT]"
+
+# batch translator function: called once, and not at all if there is nothing to fetch
+batches: list[list[str]] = []
+async def some_batch_func(keys: list[str]) -> dict[str, str]:
+    batches.append(keys)
+    return {key: some_func(key) for key in keys if key != "unknown"}
+cached_translator = CollectionTranslator(resolver_cache=ResolverCache())
+assert asyncio.run(cached_translator.translate_async(
+    ["{a}", "{b}"], batch_translator_func=some_batch_func)) == ["[A]", "[B]"]
+asyncio.run(cached_translator.translate_async("{a} {b}", batch_translator_func=some_batch_func))
+asyncio.run(cached_translator.translate_async("plain", batch_translator_func=some_batch_func))
+assert len(batches) == 1 and sorted(batches[0]) == ["a", "b"]
+try:
+    asyncio.run(cached_translator.translate_async("{unknown}", batch_translator_func=some_batch_func))
+    assert False, "KeyError expected"
+except KeyError as exc:
+    print("translate_async:", exc)
+    assert "'unknown'" in str(exc)
+
+######################################
+# SAMPLE USAGE: translate(inplace=False)
+######################################
+
+config = {"paths": {"home": "/home/{user}", "tmp": "/tmp"},
+          "limits": {"size": 10, "names": ["a", "b"]},
+          "user": ("{user}", "guest")}
+translated = CollectionTranslator(some_func).translate(config, inplace=False)
+print("====== translate(inplace=False) ========================")
+print(translated)
+# the original remains unchanged
+assert config["paths"]["home"] == "/home/{user}" and config["user"][0] == "{user}"
+assert translated["paths"]["home"] == "/home/[USER]" and translated["user"][0] == "[USER]"
+# containers without changes are shared with the original
+assert translated["limits"] is config["limits"]
+assert translated["paths"] is not config["paths"]
+# repeated strings without placeholders don't count as changes either
+doc = json.loads('{"a": {"x": "plain"}, "b": {"x": "plain"}, "d": ["hello"], "c": {"y": "hello"}}')
+translated = CollectionTranslator(some_func).translate(doc, inplace=False)
+assert translated is doc and all(translated[k] is doc[k] for k in doc)
+
+######################################
+# SAMPLE USAGE: translate_lazy
+######################################
+
+calls.clear()
+with open("tests/collection_translator_sample.json") as fp:
+    j = json.load(fp)
+view = CollectionTranslator(counting_func).translate_lazy(j)
+print("====== translate_lazy ==================================")
+# nothing is translated before values are accessed
+assert not calls and len(view) == len(j) and list(view) == list(j)
+print(view["dict"]["val2"], "- translator calls:", calls)
+assert view["dict"]["val2"] == "some_text[KEY_IN_DICT]" and calls == ["key_in_dict"]
+# values are translated only once
+view["dict"]["val2"]
+assert calls == ["key_in_dict"]
+# the original remains unchanged
+assert "{" in j["dict"]["val2"]
+
+######################################
+# SAMPLE USAGE: translate_references
+######################################
+
+from collectiontools_vrb import CyclicReferenceError
+
+config = {"paths": {"base": "{root}/app", "logs": "{paths.base}/logs"},
+          "root": "/srv", "port": 8080,
+          "log_file": "{paths.logs}/{name}-{port}.log"}
+print("====== translate_references ============================")
+CollectionTranslator(some_func).translate_references(config)
+print(json.dumps(config, indent=4))
+assert config["log_file"] == "/srv/app/logs/[NAME]-8080.log"
+try:
+    CollectionTranslator().translate_references({"a": "{b}", "b": "x{a}"})
+    assert False, "cycle not detected"
+except CyclicReferenceError as exc:
+    print(exc)
+    assert exc.cycle == ["a", "b", "a"]
+
+######################################
+# SAMPLE USAGE: subclass overriding translate_str
+######################################
+
+class UpperTranslator(CollectionTranslator):
+    def translate_str(self, s: str) -> str:
+        return super().translate_str(s).upper()
+
+t = UpperTranslator(lambda s: s)
+d = {"a": "x{v}", "b": ["{w}", ("{x}",)]}
+t.translate_dict(d)
+print("====== Subclass ========================================")
+print(d)
+assert d == {"a": "XV", "b": ["W", ("X",)]}
+assert t.translate_lazy({"a": "{v}"})["a"] == "V"
+assert t.translate_indexed(["{v}"]).root == ["V"]
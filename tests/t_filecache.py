@@ -0,0 +1,40 @@
+"""
+Sample usage of FileParseCache and FileWatcher from filecache.py
+"""
+
+import json, os, tempfile
+from collectiontools_vrb import *
+
+######################################
+# SAMPLE USAGE: FileParseCache
+######################################
+
+cache = FileParseCache()
+for _ in range(3):
+    some_dict: dict = {}
+    r = update_dict_from_json_file(some_dict, "tests/sample_data.json",
+                                   mandatory_keys=["SecondLine.Part1"], cache=cache)
+    assert r, "Mandatory keys should be found, but are missing!"
+# the file has been parsed only once
+print(f"FileParseCache: hits {cache.hits}, misses {cache.misses}")
+assert cache.hits == 2 and cache.misses == 1
+
+######################################
+# SAMPLE USAGE: FileWatcher
+######################################
+
+with tempfile.TemporaryDirectory() as tmp_dir:
+    path = os.path.join(tmp_dir, "config.json")
+    with open(path, "w") as fp:
+        json.dump({"version": 1}, fp)
+    config: dict = {}
+    watcher = FileWatcher(cache=FileParseCache())
+    watcher.watch(path, update_dict_from_json_file, mandatory_keys=["version"])
+    watcher.subscribe(lambda path, data: config.update(data))
+    assert watcher.poll() == [path] and config["version"] == 1
+    # unchanged file: nothing reloaded
+    assert watcher.poll() == []
+    with open(path, "w") as fp:
+        json.dump({"version": 22}, fp)
+    assert watcher.poll() == [path] and config["version"] == 22
+    print("FileWatcher: config after reload:", config)
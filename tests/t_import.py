@@ -0,0 +1,32 @@
+"""
+Check that importing collectiontools_vrb does not import aiohttp
+and other modules which take long to import.
+"""
+
+import subprocess, sys
+
+def modules_after(code: str) -> set[str]:
+    """ Return the names of the modules imported after running code
+    in a new interpreter.
+    """
+    result = subprocess.run([sys.executable, "-c", code + "\nimport sys\nprint(*sys.modules)"],
+                            capture_output=True, text=True, check=True)
+    return set(result.stdout.split())
+
+deferred = {"aiohttp", "asyncio", "ssl", "inspect", "traceback", "concurrent.futures"}
+
+modules = modules_after("import collectiontools_vrb")
+assert not deferred & modules, f"imported by 'import collectiontools_vrb': {deferred & modules}"
+
+modules = modules_after("from collectiontools_vrb import CollectionTranslator, "
+                        "update_dict_from_json_file, update_dict_from_key_value_file")
+assert not deferred & modules, f"imported by 'from collectiontools_vrb import ...': {deferred & modules}"
+
+# URLLoader and URLCache are imported on first access
+modules = modules_after("from collectiontools_vrb import URLLoader, URLCache")
+assert "aiohttp" in modules
+
+# the star import still provides them
+modules = modules_after("from collectiontools_vrb import *\nURLLoader, URLCache")
+assert "aiohttp" in modules
+print("import collectiontools_vrb: no aiohttp, asyncio, ssl, inspect, traceback")
@@ -0,0 +1,94 @@
+"""
+Sample usage of the JSON backends from jsonbackends.py
+"""
+
+import gc, json
+from collectiontools_vrb import *
+
+sample = "tests/collection_translator_sample.json"
+with open(sample, encoding="utf-8") as fp:
+    expected = json.load(fp)
+
+######################################
+# SAMPLE USAGE: json_backend=...
+######################################
+
+print("available JSON backends:", available_json_backends())
+assert "json" in available_json_backends()
+
+# a backend per call, by name or as decoding function
+calls: list[int] = []
+def counting_loads(data: bytes):
+    calls.append(len(data))
+    return json.loads(data)
+
+for backend in ("json", "auto", counting_loads):
+    d: dict = {}
+    assert update_dict_from_json_file(d, sample, json_backend=backend)
+    assert d == expected
+assert len(calls) == 1
+# "auto": the first one available of orjson, ujson and json
+assert get_json_backend("auto") is get_json_backend(available_json_backends()[0])
+
+# a FileParseCache keeps the results of different backends apart
+import os, tempfile
+from decimal import Decimal
+decimal_loads = lambda data: json.loads(data, parse_float=Decimal)
+cache = FileParseCache()
+with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as fp:
+    fp.write('{"x": 1.5}')
+try:
+    for backend, x in ((decimal_loads, Decimal("1.5")), ("json", 1.5), (decimal_loads, Decimal("1.5"))):
+        d = {}
+        assert update_dict_from_json_file(d, fp.name, json_backend=backend, cache=cache)
+        assert d == {"x": x} and type(d["x"]) is type(x), d
+    assert cache.hits == 1 and cache.misses == 2
+finally:
+    os.remove(fp.name)
+
+######################################
+# SAMPLE USAGE: register_json_backend, set_json_backend
+######################################
+
+register_json_backend("counting", counting_loads)
+set_json_backend("counting")
+try:
+    d = {}
+    assert update_dict_from_json_file(d, sample)
+    assert d == expected and len(calls) == 2
+finally:
+    set_json_backend("json")
+
+# lazily registered backends are imported on first use; if they are
+# not installed, the standard library is used instead
+def import_missing_package():
+    import no_such_json_package  # type: ignore
+    return no_such_json_package.loads
+register_json_backend("missing", import_missing_package, lazy=True)
+assert "missing" not in available_json_backends()
+assert get_json_backend("missing") is json.loads
+d = {}
+assert update_dict_from_json_file(d, sample, json_backend="missing")
+assert d == expected
+
+# unknown names are rejected when set, not later on every call
+try:
+    set_json_backend("nosuch")
+    assert False, "KeyError expected"
+except KeyError as exc:
+    print("set_json_backend:", exc)
+assert update_dict_from_json_file({}, sample)
+
+######################################
+# SAMPLE USAGE: pause_gc
+######################################
+
+# the garbage collector is paused only during decoding, and only if asked to
+paused: list[bool] = []
+def checking_loads(data: bytes):
+    paused.append(not gc.isenabled())
+    return json.loads(data)
+for pause_gc in (False, True):
+    assert update_dict_from_json_file({}, sample, json_backend=checking_loads,
+                                      pause_gc=pause_gc)
+assert paused == [False, True] and gc.isenabled()
@@ -0,0 +1,71 @@
+"""
+Sample usage of update_dict_from_key_value_file(s) from __init__.py
+(no network needed)
+"""
+
+import os, sys, tempfile
+from collectiontools_vrb import *
+
+some_file = "tests/sample.properties"
+some_dict: dict = {}
+assert update_dict_from_key_value_file(some_dict, some_file)
+
+######################################
+# SAMPLE USAGE: update_dict_from_key_value_files
+######################################
+
+# Read several files concurrently, merging them in the given order.
+other_dict: dict = {}
+r = update_dict_from_key_value_files(other_dict, [some_file, some_file],
+                                     print_errors_to=sys.stderr)
+assert r and other_dict == some_dict, f"Error reading files {some_file}"
+
+######################################
+# d remains unchanged on errors
+######################################
+
+# A file which can't be decoded completely leaves the dict unchanged,
+# even if its first blocks have been parsed already.
+with tempfile.NamedTemporaryFile("wb", suffix=".properties", delete=False) as fp:
+    fp.write(b"valid=line\n" * 100 + b"invalid=\xff\n")
+try:
+    other_dict = {}
+    r = update_dict_from_key_value_file(other_dict, fp.name, encoding="utf-8",
+                                        chunk_size=64)
+    assert not r and other_dict == {}
+finally:
+    os.remove(fp.name)
+
+######################################
+# SAMPLE USAGE: update_dict_from_key_value_files with cache
+######################################
+
+# files found in the cache are not read again
+cache = FileParseCache()
+for hits in (0, 2):
+    other_dict = {}
+    assert update_dict_from_key_value_files(other_dict, [some_file, some_file], 
+                                            cache=cache)
+    assert other_dict == some_dict and cache.hits == hits
+# shared with update_dict_from_key_value_file()
+other_dict = {}
+assert update_dict_from_key_value_file(other_dict, some_file, cache=cache)
+assert other_dict == some_dict and cache.hits == 3
+
+######################################
+# errors of the executor
+######################################
+
+# handled like errors reading a file: printed (or reraised if requested)
+from concurrent.futures import ThreadPoolExecutor
+executor = ThreadPoolExecutor(1)
+executor.shutdown()
+other_dict = {}
+assert not update_dict_from_key_value_files(other_dict, [some_file], executor=executor)
+assert other_dict == {}
+try:
+    update_dict_from_key_value_files(other_dict, [some_file], executor=executor,
+                                     reraise_exc=True)
+    assert False, "RuntimeError expected"
+except RuntimeError as exc:
+    print("shut down executor:", exc)
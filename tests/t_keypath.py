@@ -0,0 +1,70 @@
+"""
+Sample usage of KeyPath, KeyPathTrie and the path helpers from keypath.py
+"""
+
+import io
+from collectiontools_vrb import *
+
+######################################
+# SAMPLE USAGE: KeyPath and helpers
+######################################
+
+config: dict = {"db": {"host": "localhost", "port": 5432}, "name": "sample"}
+
+port = KeyPath("db.port")
+assert port.contains(config) and port.get(config) == 5432
+assert get_path(config, "db.user", "nobody") == "nobody"
+# a path through a non-dict value does not exist
+assert not dict_contains_path(config, "name.x")
+
+set_path(config, "db/pool/size", 10, sep="/")
+assert config["db"]["pool"] == {"size": 10}
+delete_path(config, "db.pool")
+assert "pool" not in config["db"]
+try:
+    delete_path(config, "db.pool")
+    assert False, "KeyError expected"
+except KeyError:
+    pass
+print("KeyPath: config after changes:", config)
+
+######################################
+# SAMPLE USAGE: KeyPathTrie
+######################################
+
+trie = KeyPathTrie(["db.host", "db.user", "db.port", "cache.size", "name"])
+missing = trie.missing(config)
+print("KeyPathTrie: missing keys:", missing)
+assert missing == ["db.user", "cache.size"]
+
+# update_dict_from_json_file reports all missing mandatory keys
+errors = io.StringIO()
+assert not update_dict_from_json_file({}, "tests/sample_data.json",
+                                      mandatory_keys=["SecondLine.Part1", "abc", "x.y"],
+                                      print_errors_to=errors)
+assert "'abc'" in errors.getvalue() and "'x.y'" in errors.getvalue()
+
+######################################
+# SAMPLE USAGE: PathIndex
+######################################
+
+index = PathIndex()
+assert update_dict_from_json_file(index, "tests/sample_data.json",
+                                  mandatory_keys=["SecondLine.Part1"])
+assert index.contains("SecondLine.Part1")
+assert dict_contains_path(index, "SecondLine.Part1")
+assert index.get_path("SecondLine") is index["SecondLine"]
+
+index.set_path("db.pool.size", 10)
+assert index.get_path("db.pool") == {"size": 10} and index.data["db"]["pool"]["size"] == 10
+index["db"] = {"host": "localhost"}
+assert not index.contains("db.pool.size") and index.get_path("db.host") == "localhost"
+index.delete_path("db.host")
+assert not index.contains("db.host") and index.contains("db")
+# after changing the nested dicts directly, the index has to be rebuilt
+index.data["db"]["port"] = 5432
+assert not index.contains("db.port")
+index.reindex()
+assert index.get_path("db.port") == 5432
+assert KeyPathTrie(["db.port", "db.user"]).missing(index) == ["db.user"]
+print("PathIndex: paths:", sorted(index.paths()))
@@ -0,0 +1,67 @@
+"""
+Sample usage of LayeredConfig from layered.py
+"""
+
+import asyncio
+from collectiontools_vrb import *
+
+######################################
+# SAMPLE USAGE: LayeredConfig
+######################################
+
+defaults = {"db": {"host": "db.example.com", "port": 5432, "pool": {"size": 5}},
+            "log_level": "INFO"}
+config = LayeredConfig({"defaults": defaults})
+# load a layer using one of the update_dict_from_... functions
+assert config.load("file", update_dict_from_key_value_file, "tests/sample.properties")
+config.set_layer("overrides", {"db": {"host": "localhost"}, "log_level": "DEBUG"})
+print("LayeredConfig: layers", config.layer_names)
+print("LayeredConfig: db =", config["db"])
+
+# later layers override earlier ones, nested dicts are merged
+assert config.get_path("db.host") == "localhost"
+assert config.get_path("db.pool.size") == 5
+assert config["db"] == {"host": "localhost", "port": 5432, "pool": {"size": 5}}
+assert config.get_path("db.user", "nobody") == "nobody"
+assert not config.contains("db.user") and "log_level" in config
+# the layers themselves remain unchanged
+assert defaults["db"]["host"] == "db.example.com"
+
+# replacing a layer affects only the values it contains
+config.set_layer("overrides", {"db": {"pool": {"size": 20}}})
+assert config.get_path("db.host") == "db.example.com"
+assert config.get_path("db.pool.size") == 20
+assert config["log_level"] == "INFO"
+
+# a value which is not a dict hides the dicts below it
+assert config.get_path("db.pool.size") == 20
+config.set_layer("pool", {"db": {"pool": None}})
+assert config["db"]["pool"] is None and not config.contains("db.pool.size")
+config.remove_layer("pool")
+assert config.get_path("db.pool.size") == 20
+
+# a failing loader leaves the layer unchanged
+assert not config.load("overrides", update_dict_from_json_file, "tests/missing.json",
+                       print_errors_to=None)
+assert config.get_path("db.pool.size") == 20
+
+# layers changed directly need changed() to discard cached lookups
+config.layer("overrides")["db"]["pool"]["size"] = 30
+config.changed()
+assert config.get_path("db.pool.size") == 30
+
+# load_async() for the ..._async functions
+async def load_async(d: dict, value: int) -> bool:
+    d["db"] = {"port": value}
+    return True
+assert asyncio.run(config.load_async("url", load_async, 6543))
+assert config.get_path("db.port") == 6543
+
+config.remove_layer("url")
+print("LayeredConfig: merged", config.to_dict())
+
+# reloading a layer again and again doesn't accumulate bookkeeping data
+for i in range(1000):
+    config.set_layer("overrides", {"db": {"host": f"host{i}"}})
+    assert config.get_path("db.host") == f"host{i}"
+assert len(config._below[("db",)]) <= 2
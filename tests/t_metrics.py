@@ -0,0 +1,75 @@
+"""
+Sample usage of the hooks and Stats from metrics.py
+"""
+
+import asyncio, json
+from collectiontools_vrb import *
+
+######################################
+# SAMPLE USAGE: hooks
+######################################
+
+events: list[tuple[str, dict]] = []
+def hook(event: str, fields: dict):
+    events.append((event, fields))
+
+add_hook(hook)
+some_dict: dict = {}
+assert update_dict_from_key_value_file(some_dict, "tests/sample.properties")
+remove_hook(hook)
+# not reported after the hook has been removed
+update_dict_from_key_value_file(some_dict, "tests/sample.properties")
+
+assert len(events) == 1
+event, fields = events[0]
+print(f"hook: {event}: {fields}")
+assert event == "update_dict_from_key_value_file" and fields["ok"]
+assert fields["keys"] == len(some_dict) and fields["lines"] >= fields["keys"]
+
+######################################
+# SAMPLE USAGE: Stats
+######################################
+
+def some_func(s: str) -> str: return f"[{s.upper()}]"
+t = CollectionTranslator(some_func, cache_per_call=True)
+
+with Stats() as stats:
+    for _ in range(3):
+        config: dict = {}
+        update_dict_from_json_file(config, "tests/collection_translator_sample.json")
+        t.translate(config)
+    update_dict_from_json_file({}, "tests/no_such_file.json")
+    t.translate_str("{a} and {a}")
+    asyncio.run(t.translate_async(["{x}", "{y}"]))
+
+summary = stats.summary()
+print("Stats:", json.dumps({event: {k: v for k, v in s.items() if k != "latency"}
+                            for event, s in summary.items()}, indent=4))
+assert summary["update_dict_from_json_file"]["calls"] == 4
+assert summary["update_dict_from_json_file"]["failures"] == 1
+assert summary["translate_str"]["totals"] == {"placeholders": 2, "translator_calls": 1}
+assert summary["translate_async"]["totals"]["translator_calls"] == 2
+assert summary["resolve"]["calls"] == summary["translate"]["totals"]["translator_calls"] + 3
+latency = summary["resolve"]["latency"]
+print(f"translator function latency: p50 <= {latency['p50'] * 1e6:.0f}µs, "
+      f"p99 <= {latency['p99'] * 1e6:.0f}µs")
+
+######################################
+# SAMPLE USAGE: parallel functions
+######################################
+
+from concurrent.futures import ThreadPoolExecutor
+
+# only the outermost call is reported, also if the work is done by
+# worker threads, and its counters include the workers' counters
+events.clear()
+add_hook(hook)
+with ThreadPoolExecutor(4) as executor:
+    t.translate_parallel({f"k{i}": f"{{key{i}}}" for i in range(10)}, executor, chunk_size=3)
+update_dict_from_key_value_files({}, ["tests/sample.properties"] * 3)
+remove_hook(hook)
+reported = [(event, fields) for event, fields in events if event != "resolve"]
+print("parallel:", reported)
+assert [event for event, _ in reported] == ["translate_parallel", "update_dict_from_key_value_files"]
+assert reported[0][1]["placeholders"] == 10 and reported[0][1]["translator_calls"] == 10
+assert reported[1][1]["lines"] == 3 * fields["lines"] and reported[1][1]["bytes"] > 0
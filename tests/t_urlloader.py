@@ -0,0 +1,259 @@
+"""
+Sample usage of URLLoader and URLCache from urlloader.py,
+reading from a local aiohttp server (no network needed)
+"""
+
+import asyncio, os, tempfile, threading, time
+from aiohttp import web
+from collectiontools_vrb import *
+
+class SampleServer:
+    """ aiohttp server in a background thread. Serves
+      - /etag: key-value text with an ETag
+      - /last_modified: the same text with a Last-Modified header
+      - /plain: the same text without validators
+      - /chunked: the same text, sent in pieces without Content-Length
+      - /crlf: text with "\r\n" line breaks and non-ASCII characters
+      - /slow: the same text as /etag, after a second
+      - /stalled: the text of /chunked twice, then nothing for 3 seconds
+    Answers conditional requests with 304 (Not Modified) and counts them.
+    """
+
+    text = "name = Miller\ncity=  Bonn\n# no key-value-pair\nempty=\n"
+    crlf_text = "straße=Hauptstraße\r\ncity=Köln\r\n\r\nsign=€\r\nlast=no line break"
+    last_modified = "Wed, 21 Oct 2015 07:28:00 GMT"
+
+    def __init__(self):
+        self.requests = 0
+        self.not_modified = 0
+        self._loop = asyncio.new_event_loop()
+        app = web.Application()
+        app.router.add_get("/{name}", self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        self._loop.run_until_complete(self._runner.setup())
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        self._loop.run_until_complete(site.start())
+        self.port = self._runner.addresses[0][1]
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def url(self, name: str) -> str:
+        return f"http://127.0.0.1:{self.port}/{name}"
+
+    async def _handle(self, request: web.Request) -> web.StreamResponse:
+        self.requests += 1
+        name = request.match_info["name"]
+        headers = {}
+        if name == "etag":
+            headers["ETag"] = '"v1"'
+            unchanged = request.headers.get("If-None-Match") == '"v1"'
+        elif name == "last_modified":
+            headers["Last-Modified"] = self.last_modified
+            unchanged = request.headers.get("If-Modified-Since") == self.last_modified
+        elif name == "plain":
+            unchanged = False
+        elif name == "slow":
+            await asyncio.sleep(1)
+            unchanged = False
+        elif name == "crlf":
+            return web.Response(text=self.crlf_text, charset="utf-8")
+        elif name in ("chunked", "stalled"):
+            response = web.StreamResponse(headers={"Content-Type": "text/plain"})
+            response.enable_chunked_encoding()
+            await response.prepare(request)
+            body = self.text.encode()
+            for i in range(0, len(body), 5):
+                await response.write(body[i:i + 5])
+            if name == "stalled":
+                await response.write(body)
+                await asyncio.sleep(3)
+            try:
+                await response.write_eof()
+            except ConnectionResetError:
+                pass  # client has given up
+            return response
+        else:
+            raise web.HTTPNotFound()
+        if unchanged:
+            self.not_modified += 1
+            return web.Response(status=304, headers=headers)
+        return web.Response(text=self.text, headers=headers)
+
+    def close(self):
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+server = SampleServer()
+expected = {"name": "Miller", "city": "Bonn", "empty": ""}
+
+######################################
+# SAMPLE USAGE: update_dict_from_urls with a pooled URLLoader
+######################################
+
+# Read several URLs concurrently, merging them in the given order
+# (later URLs take precedence). The loader keeps its connections
+# open for further calls.
+some_dict: dict = {"name": "unknown", "city": "Köln"}
+with URLLoader(limit_per_host=4) as loader:
+    assert update_dict_from_urls(some_dict, [server.url("crlf"), server.url("plain")],
+                                 loader=loader)
+    assert some_dict["name"] == "Miller" and some_dict["city"] == "Bonn"
+    assert some_dict["straße"] == "Hauptstraße"
+    assert update_dict_from_url(some_dict, server.url("crlf"), loader=loader)
+    assert some_dict["city"] == "Köln"
+    # URLs which can't be read are skipped
+    some_dict = {}
+    assert not update_dict_from_urls(some_dict, [server.url("plain"), server.url("nosuch")],
+                                     loader=loader)
+    assert some_dict == expected
+    # the slow URLs are read at the same time, not one after the other
+    start = time.perf_counter()
+    assert update_dict_from_urls({}, [server.url("slow")] * 4, loader=loader)
+    seconds = time.perf_counter() - start
+    print(f"4 URLs taking 1 second each, read in {seconds:.2f} seconds")
+    assert seconds < 2
+
+######################################
+# SAMPLE USAGE: URLCache
+######################################
+
+# The second read of a URL sends the ETag / Last-Modified validators of
+# the first response. The server answers "304 Not Modified", and the
+# cached result is used without downloading and parsing again.
+for stream in (False, True):
+    for name in ("etag", "last_modified"):
+        cache = URLCache()
+        server.not_modified = 0
+        for _ in range(2):
+            some_dict: dict = {}
+            assert update_dict_from_url(some_dict, server.url(name), cache=cache, stream=stream)
+            assert some_dict == expected, some_dict
+        print(f"URLCache ({name}, stream={stream}):", cache.stats)
+        assert cache.stats == {"hits": 1, "misses": 1, "not_modified": 1}
+        assert server.not_modified == 1
+
+# responses without validators are not cached
+cache = URLCache()
+for _ in range(2):
+    assert update_dict_from_url({}, server.url("plain"), cache=cache)
+assert len(cache) == 0 and cache.misses == 2
+
+# results parsed with a different sep or strip are not reused
+cache = URLCache()
+assert update_dict_from_url({}, server.url("etag"), cache=cache)
+some_dict = {}
+assert update_dict_from_url(some_dict, server.url("etag"), cache=cache, strip=False)
+assert some_dict["name "] == " Miller" and cache.misses == 2
+some_dict = {}
+assert update_dict_from_url(some_dict, server.url("etag"), cache=cache, sep=":")
+assert some_dict == {} and cache.misses == 3 and cache.not_modified == 0
+# ... but the last one stored is
+assert update_dict_from_url(some_dict, server.url("etag"), cache=cache, sep=":")
+assert cache.hits == 1 and cache.not_modified == 1
+
+# a cache with a path survives the process: it is saved to a JSON file
+with tempfile.TemporaryDirectory() as tmp_dir:
+    path = os.path.join(tmp_dir, "url_cache.json")
+    assert update_dict_from_url({}, server.url("etag"), cache=URLCache(path))
+    cache = URLCache(path)
+    some_dict = {}
+    assert update_dict_from_url(some_dict, server.url("etag"), cache=cache)
+    assert some_dict == expected and cache.not_modified == 1
+
+    # saved once per call, not once per URL
+    class CountingURLCache(URLCache):
+        saves = 0
+        def save(self):
+            self.saves += 1
+            super().save()
+    cache = CountingURLCache(path)
+    assert update_dict_from_urls({}, [server.url("etag"), server.url("last_modified")],
+                                 cache=cache)
+    assert cache.saves == 1 and len(URLCache(path)) == 2
+    # URLLoader.fetch() doesn't save
+    cache = URLCache(path)
+    cache.invalidate()
+    with URLLoader(cache=cache) as loader:
+        assert loader.run(loader.fetch(server.url("etag"))) == expected
+    assert len(URLCache(path)) == 0
+    cache.save()
+    assert len(URLCache(path)) == 1
+
+######################################
+# SAMPLE USAGE: streaming, max_size
+######################################
+
+# In streaming mode, the body is parsed while it is downloaded. Chunks
+# (here: 3 bytes) may end within a line, within "\r\n" or within a
+# multibyte character.
+crlf_expected = {"straße": "Hauptstraße", "city": "Köln", "sign": "€", "last": "no line break"}
+for stream in (False, True):
+    with URLLoader(stream=stream, chunk_size=3) as loader:
+        for name, result in (("crlf", crlf_expected), ("chunked", expected)):
+            some_dict = {}
+            assert update_dict_from_url(some_dict, server.url(name), loader=loader)
+            assert some_dict == result, some_dict
+
+# Line counts of the "fetch" event: lines split across chunks count once
+with Stats() as stats, URLLoader(stream=True, chunk_size=3) as loader:
+    assert update_dict_from_url({}, server.url("crlf"), loader=loader)
+assert stats.summary()["fetch"]["totals"]["lines"] == len(SampleServer.crlf_text.splitlines())
+
+# Responses larger than max_size are rejected: with Content-Length
+# before reading the body, without it (chunked) once max_size is exceeded
+small = len(SampleServer.text) - 1
+for stream in (False, True):
+    for name in ("plain", "chunked"):
+        some_dict = {}
+        assert not update_dict_from_url(some_dict, server.url(name), stream=stream,
+                                        max_size=small)
+        assert some_dict == {}
+        assert update_dict_from_url(some_dict, server.url(name), stream=stream,
+                                    max_size=small + 1)
+        assert some_dict == expected
+
+# without Content-Length, the download is aborted as soon as max_size is
+# exceeded, not read completely first
+for stream in (False, True):
+    start = time.perf_counter()
+    assert not update_dict_from_url({}, server.url("stalled"), stream=stream,
+                                    max_size=len(SampleServer.text) + 1)
+    assert time.perf_counter() - start < 2
+# the body is decoded as announced by the response
+some_dict = {}
+assert update_dict_from_url(some_dict, server.url("crlf"), max_size=1000)
+assert some_dict == crlf_expected
+
+######################################
+# SAMPLE USAGE: timeout
+######################################
+
+# default: 300 seconds (as aiohttp)
+some_dict = {}
+assert not update_dict_from_url(some_dict, server.url("slow"), timeout=0.2)
+assert some_dict == {}
+assert update_dict_from_url(some_dict, server.url("slow"))
+assert some_dict == expected
+
+######################################
+# _LineSplitter (used for streaming)
+######################################
+
+from collectiontools_vrb._common import _LineSplitter
+
+def split(pieces: list[str]) -> list[str]:
+    splitter = _LineSplitter()
+    lines = [line for piece in pieces for line in splitter.feed(piece)]
+    return lines + splitter.close()
+
+text = "a=1\r\nb=2\n\r\nc=3\rd=4\x85e=5"
+# split at every position
+for i in range(len(text) + 1):
+    assert split([text[:i], text[i:]]) == text.splitlines(), i
+assert split(list(text)) == text.splitlines()
+assert split(["x\r", "\n", "\r"]) == ["x", ""]
+assert split([]) == [] and split([""]) == []
+
+server.close()